@@ -1,12 +1,232 @@
-import sys, json, traceback
-from pathlib import Path
+import mmap, os, sys, json, traceback
+from dataclasses import dataclass
+from typing import List, Optional
 
 try:
     import chromadb
+    import numpy as np
 except Exception as e:
+    if __name__ != '__main__':
+        raise
     print('import-error', str(e))
     sys.exit(2)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# Payload schema. With msgspec the JSON decodes straight into these structs
+# (no intermediate dicts); otherwise equivalent dataclasses are built from dicts.
+# VectorDBService always writes metadata, so it is required rather than
+# defaulted: the decode validates every document once, up front.
+if msgspec is not None:
+    class Doc(msgspec.Struct):
+        id: str
+        content: str
+        metadata: dict
+        embeddings: Optional[List[float]] = None
+
+    class Payload(msgspec.Struct):
+        collection_name: str
+        documents: List[Doc]
+        embeddings_file: Optional[str] = None
+        dtype: str = 'float32'
+        scales_file: Optional[str] = None
+        shape: Optional[List[int]] = None
+else:
+    @dataclass
+    class Doc:
+        id: str
+        content: str
+        metadata: dict
+        embeddings: Optional[List[float]] = None
+
+    @dataclass
+    class Payload:
+        collection_name: str
+        documents: List[Doc]
+        embeddings_file: Optional[str] = None
+        dtype: str = 'float32'
+        scales_file: Optional[str] = None
+        shape: Optional[List[int]] = None
+
+# Rows per collection.add call; large single adds regress badly in Chroma
+ADD_BATCH_SIZE = 5000
+
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# WAL lets queries read while a bulk add commits; mmap_size (1 GiB) serves hot
+# index pages from the OS page cache instead of pread(); cache_size is 256 MiB.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=1073741824",
+    "cache_size=-262144",
+)
+
+
+def load_payload(payload_path):
+    """Decode the payload file into a Payload.
+
+    The file is memory-mapped and parsed from the mapped bytes, so it is never
+    copied into a Python bytes/str object first. zstd-compressed payloads
+    (written when the producer has zstandard installed) are detected by their
+    frame magic and decompressed first.
+    """
+    with open(payload_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _decode_payload(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:4] == ZSTD_MAGIC:
+                import zstandard
+                return _decode_payload(zstandard.ZstdDecompressor().decompress(mm))
+            with memoryview(mm) as view:
+                return _decode_payload(view)
+
+
+def _decode_payload(buf):
+    if msgspec is not None:
+        return msgspec.json.decode(buf, type=Payload)
+    if orjson is not None:
+        data = orjson.loads(buf)
+    else:
+        data = json.loads(bytes(buf))
+    data['documents'] = [Doc(**d) for d in data['documents']]
+    return Payload(**data)
+
+
+def describe_payload_error(e):
+    """Terse JSON-able description of an expected (bad input) payload error, else None."""
+    if isinstance(e, FileNotFoundError):
+        return {"error": "payload_not_found", "path": e.filename}
+    if isinstance(e, KeyError):
+        return {"error": "missing_key", "key": str(e)}
+    if isinstance(e, (ValueError, TypeError)) or (msgspec is not None and isinstance(e, msgspec.DecodeError)):
+        # json/orjson decode errors are ValueErrors; schema mismatches raise
+        # TypeError (dataclasses) or msgspec.ValidationError (a DecodeError)
+        return {"error": "invalid_payload", "detail": str(e)}
+    return None
+
+
+def build_columns(payload):
+    """Split the per-document records into ids/embeddings/metadatas/documents in one pass.
+
+    Producers write embeddings as a .npy side-car; older payloads still carry
+    them inline per document, in which case they are copied straight into a
+    preallocated float32 matrix.
+    """
+    docs = payload.documents
+    n = len(docs)
+    ids = [None] * n
+    metadatas = [None] * n
+    documents = [None] * n
+
+    if payload.embeddings_file:
+        embeddings = np.load(payload.embeddings_file, mmap_mode='r')
+        if payload.dtype == 'int8':
+            # Per-row symmetric int8: value = q * scale
+            scales = np.load(payload.scales_file)
+            embeddings = embeddings.astype(np.float32) * scales[:, None]
+        elif embeddings.dtype != np.float32:
+            # Chroma's HNSW index stores float32 only
+            embeddings = embeddings.astype(np.float32)
+        inline = False
+    else:
+        dim = len(docs[0].embeddings) if n else 0
+        embeddings = np.empty((n, dim), dtype=np.float32)
+        inline = True
+
+    for i, d in enumerate(docs):
+        ids[i] = d.id
+        metadatas[i] = d.metadata
+        documents[i] = d.content
+        if inline:
+            embeddings[i] = d.embeddings
+
+    return ids, embeddings, metadatas, documents
+
+
+def make_client(db_path):
+    """Connect to a running Chroma server when CHROMA_HOST is set.
+
+    A long-lived `chroma run --path <db_path>` keeps SQLite and the HNSW
+    indices warm, so each worker run skips re-opening them from disk.
+    """
+    host = os.getenv('CHROMA_HOST')
+    if host:
+        return chromadb.HttpClient(host=host, port=int(os.getenv('CHROMA_PORT', '8000')))
+    return chromadb.PersistentClient(path=db_path)
+
+
+def tune_sqlite(client):
+    """Relax fsync-per-insert defaults on Chroma's SQLite connection (best effort)."""
+    try:
+        conn = client._sysdb._conn_pool.connect()
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(f"pragma {pragma}")
+    except Exception:
+        # Private API; layout differs between Chroma releases
+        pass
+
+
+def add_in_batches(collection, ids, embeddings, metadatas, documents,
+                   batch_size=ADD_BATCH_SIZE, workers=1):
+    """Add rows in batch_size slices, optionally issuing slices concurrently."""
+    def add_slice(start):
+        end = start + batch_size
+        collection.add(
+            ids=ids[start:end],
+            embeddings=embeddings[start:end],
+            metadatas=metadatas[start:end],
+            documents=documents[start:end],
+        )
+
+    starts = range(0, len(ids), batch_size)
+    if workers <= 1 or len(starts) <= 1:
+        for start in starts:
+            add_slice(start)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() re-raises the first failed batch
+        list(pool.map(add_slice, starts))
+
+
+def add_columns(client, collection_name, ids, embeddings, metadatas, documents, workers=1):
+    """Open (or create) the collection on client and add the columns in batches.
+
+    Used by the __main__ entry point and called in-process by VectorDBService.
+    """
+    tune_sqlite(client)
+    collection = client.create_collection(name=collection_name, get_or_create=True)
+    add_in_batches(collection, ids, embeddings, metadatas, documents, workers=workers)
+    return collection
+
+
+def run(db_path, payload):
+    """Add a decoded payload to the Chroma database at db_path."""
+    ids, embeddings, metadatas, documents = build_columns(payload)
+    return add_columns(make_client(db_path), payload.collection_name,
+                       ids, embeddings, metadatas, documents, workers=add_workers())
+
+
+def add_workers():
+    # A Chroma server accepts concurrent writers; a local PersistentClient
+    # directory must only ever be written by one process/thread at a time.
+    if os.getenv('CHROMA_HOST'):
+        return max(1, int(os.getenv('CHROMA_ADD_WORKERS', min(4, os.cpu_count() or 1))))
+    return 1
+
+
 if __name__ == '__main__':
     if len(sys.argv) < 3:
         print('usage: chroma_worker.py <db_path> <payload_json>')
@@ -15,19 +235,18 @@ if __name__ == '__main__':
     payload_path = sys.argv[2]
 
     try:
-        payload = json.loads(Path(payload_path).read_text())
-        collection_name = payload['collection_name']
-        docs = payload['documents']
-
-        client = chromadb.PersistentClient(path=db_path)
-        collection = client.create_collection(name=collection_name, get_or_create=True)
-
-        ids = [d['id'] for d in docs]
-        embeddings = [d['embeddings'] for d in docs]
-        metadatas = [d.get('metadata', {}) for d in docs]
-        documents = [d['content'] for d in docs]
+        payload = load_payload(payload_path)
+    except Exception as e:
+        error = describe_payload_error(e)
+        if error is None:
+            traceback.print_exc()
+        else:
+            # Bad input is an expected failure; skip the traceback formatting
+            print(json.dumps(error))
+        sys.exit(3)
 
-        collection.add(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+    try:
+        run(db_path, payload)
         print('added')
     except Exception as e:
         traceback.print_exc()
@@ -1,32 +1,48 @@
-import time, json, requests, sys
+import time, json, httpx, sys
 from pathlib import Path
 
 BASE_URL = 'http://localhost:8001'
 PDF_PATH = Path('data/uploads/72c9ecca-bc56-466d-bb4c-1436750095f4_LimitX_Pitch_Deck_Analysis.pdf')
+READY_TIMEOUT = 20.0
 
-print('Uploading PDF...')
-files = {'file': open(PDF_PATH, 'rb')}
-res = requests.post(BASE_URL + '/api/v1/rag/upload', files=files)
-print('Upload HTTP:', res.status_code, res.text[:200])
-if res.status_code != 200:
-    sys.exit(1)
+# One keep-alive connection for the upload, the status polls and the query
+with httpx.Client(base_url=BASE_URL, timeout=10) as client:
+    print('Uploading PDF...')
+    # httpx streams file objects in chunks and derives Content-Length from the file size
+    with open(PDF_PATH, 'rb') as pdf:
+        files = {'file': (PDF_PATH.name, pdf, 'application/pdf')}
+        res = client.post('/api/v1/rag/upload', files=files, timeout=None)
+    print('Upload HTTP:', res.status_code, res.text[:200])
+    if res.status_code != 200:
+        sys.exit(1)
 
-data = res.json()
-collection = data.get('collection_name')
-print('Collection:', collection)
+    data = res.json()
+    collection = data.get('collection_name')
+    print('Collection:', collection)
 
-print('Polling for collection to be ready...')
-# We will try querying until it returns a non-empty answer
-for i in range(20):
-    time.sleep(1)
-    try:
-        r = requests.post(BASE_URL + '/api/v1/rag/query', json={'question':'What is the overall rating?','collection_name':collection,'top_k':3}, timeout=10)
-        print('Query attempt', i, 'status', r.status_code)
-        if r.status_code == 200:
-            print('Query response:', r.json())
+    print('Waiting for collection to be ready...')
+    # Poll the status endpoint with exponential backoff instead of hammering /rag/query
+    backoff = 0.1
+    deadline = time.monotonic() + READY_TIMEOUT
+    status = {}
+    while time.monotonic() < deadline:
+        try:
+            r = client.get(f'/api/v1/rag/status/{collection}')
+            status = r.json() if r.status_code == 200 else {'status': f'http {r.status_code}'}
+        except Exception as e:
+            status = {'status': f'exception: {e}'}
+        if status.get('ready') or status.get('status') == 'failed':
             break
-        else:
-            print('Query failed:', r.text[:200])
-    except Exception as e:
-        print('Query exception:', e)
+        time.sleep(backoff)
+        backoff = min(backoff * 2, 2.0)
+    print('Status:', status)
+    if not status.get('ready'):
+        sys.exit(1)
+
+    r = client.post('/api/v1/rag/query', json={'question':'What is the overall rating?','collection_name':collection,'top_k':3})
+    print('Query status', r.status_code)
+    if r.status_code == 200:
+        print('Query response:', r.json())
+    else:
+        print('Query failed:', r.text[:200])
 print('Done')
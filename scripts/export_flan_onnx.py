@@ -0,0 +1,52 @@
+"""
+Export FLAN-T5-small to an int8-quantized ONNX model for flan_worker.py.
+
+Run once after downloading the model:
+
+    python scripts/export_flan_onnx.py
+
+Requires: pip install optimum[onnxruntime]
+"""
+
+from pathlib import Path
+import shutil
+import sys
+
+project_root = Path(__file__).resolve().parents[1]
+models_dir = project_root / "src" / "agents" / "rag_system" / "models"
+source_path = models_dir / "flan-t5-small"
+target_path = models_dir / "flan-t5-small-onnx-int8"
+
+
+def main():
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        print(f"optimum[onnxruntime] is required: {e}")
+        sys.exit(1)
+
+    export_dir = target_path.with_name(target_path.name + "-fp32")
+    print(f"Exporting {source_path} -> {export_dir}")
+    model = ORTModelForSeq2SeqLM.from_pretrained(str(source_path), export=True)
+    model.save_pretrained(str(export_dir))
+
+    # Dynamic int8 quantization; avx512_vnni kernels fall back gracefully on older CPUs
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    for onnx_file in sorted(export_dir.glob("*.onnx")):
+        print(f"Quantizing {onnx_file.name}")
+        quantizer = ORTQuantizer.from_pretrained(str(export_dir), file_name=onnx_file.name)
+        quantizer.quantize(save_dir=str(target_path), quantization_config=qconfig)
+
+    AutoTokenizer.from_pretrained(str(source_path)).save_pretrained(str(target_path))
+    for config_file in ("config.json", "generation_config.json"):
+        if (export_dir / config_file).exists():
+            shutil.copy(export_dir / config_file, target_path / config_file)
+
+    shutil.rmtree(export_dir, ignore_errors=True)
+    print(f"Quantized model saved to {target_path}")
+
+
+if __name__ == "__main__":
+    main()
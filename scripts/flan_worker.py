@@ -1,27 +1,127 @@
-import sys, json, traceback
+import os, sys, json, traceback
+from functools import lru_cache
 from pathlib import Path
 
+project_root = Path(__file__).resolve().parents[1]
+models_dir = project_root / 'src' / 'agents' / 'rag_system' / 'models'
+MODEL_PATH = models_dir / 'flan-t5-small'
+# Produced once by scripts/export_flan_onnx.py
+ONNX_INT8_PATH = models_dir / 'flan-t5-small-onnx-int8'
+# Distinct prompts whose answers are kept; decoding is greedy, so a repeated
+# prompt always yields the same text.
+ANSWER_CACHE_SIZE = 128
+
+
+def load_generator():
+    """Return a generate(prompt, max_new_tokens) callable with an answer cache.
+
+    Prefers the int8-quantized ONNX Runtime export when it exists and optimum
+    is installed; otherwise falls back to the transformers model, in reduced
+    precision where the hardware supports it (see select_device_and_dtype).
+    """
+    return lru_cache(maxsize=ANSWER_CACHE_SIZE)(_load_model_generator())
+
+
+def _load_model_generator():
+    if ONNX_INT8_PATH.exists():
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+            from transformers import AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(str(ONNX_INT8_PATH))
+            model = ORTModelForSeq2SeqLM.from_pretrained(str(ONNX_INT8_PATH))
+
+            def generate(prompt, max_new_tokens):
+                inputs = tokenizer(prompt, return_tensors='pt', truncation=True)
+                out = model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False)
+                return tokenizer.decode(out[0], skip_special_tokens=True)
+
+            return generate
+        except ImportError:
+            pass
+
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    device, dtype = select_device_and_dtype(torch)
+    tokenizer = AutoTokenizer.from_pretrained(str(MODEL_PATH))
+    model = AutoModelForSeq2SeqLM.from_pretrained(str(MODEL_PATH), torch_dtype=dtype)
+    model = model.to(device).eval()
+
+    def generate(prompt, max_new_tokens):
+        inputs = tokenizer(prompt, return_tensors='pt', truncation=True).to(device)
+        with torch.inference_mode():
+            out = model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False)
+        return tokenizer.decode(out[0], skip_special_tokens=True)
+
+    return generate
+
+
+def select_device_and_dtype(torch):
+    """Pick the device and weight dtype for the transformers path.
+
+    FLAN_DTYPE=auto (default) uses bfloat16 on CUDA when supported, float16 on
+    other CUDA GPUs and float32 on CPU, where bfloat16 is only faster with
+    native AVX-512-BF16/AMX support; set FLAN_DTYPE=bfloat16 to opt in there.
+    """
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    requested = os.getenv('FLAN_DTYPE', 'auto').lower()
+    if requested != 'auto':
+        dtype = getattr(torch, requested)
+    elif device == 'cuda':
+        dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    else:
+        dtype = torch.float32
+    if device == 'cpu' and dtype != torch.float32:
+        torch.set_float32_matmul_precision('medium')
+    return device, dtype
+
+
+def serve():
+    """Load the model once and answer one JSON request per stdin line."""
+    generate = load_generator()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            generated_text = generate(request.get('prompt', ''), request.get('max_new_tokens', 256))
+            response = {"generated_text": generated_text}
+        except (ValueError, AttributeError) as e:
+            # Malformed request line: answer tersely, no traceback
+            response = {"error": "invalid_request", "detail": str(e)}
+        except Exception as e:
+            traceback.print_exc()
+            response = {"error": str(e)}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
 # Usage: python flan_worker.py payload.json
+#        python flan_worker.py --serve   (JSON lines on stdin/stdout)
 if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+        serve()
+        sys.exit(0)
     try:
         if len(sys.argv) < 2:
             print(json.dumps({"error": "No payload file provided"}))
             sys.exit(2)
         payload_path = Path(sys.argv[1])
-        payload = json.loads(payload_path.read_text())
-        prompt = payload.get('prompt', '')
-        max_new_tokens = payload.get('max_new_tokens', 256)
-
-        # Resolve model path relative to project root
-        project_root = Path(__file__).resolve().parents[1]
-        model_path = project_root / 'src' / 'agents' / 'rag_system' / 'models' / 'flan-t5-small'
-
-        from transformers import pipeline
-        qa = pipeline('text2text-generation', model=str(model_path), device=-1)
+        try:
+            payload = json.loads(payload_path.read_text())
+            prompt = payload.get('prompt', '')
+            max_new_tokens = payload.get('max_new_tokens', 256)
+        except FileNotFoundError as e:
+            print(json.dumps({"error": "payload_not_found", "path": str(payload_path)}))
+            sys.exit(3)
+        except (ValueError, AttributeError) as e:
+            print(json.dumps({"error": "invalid_payload", "detail": str(e)}))
+            sys.exit(3)
 
-        out = qa(prompt, max_new_tokens=max_new_tokens, do_sample=False)
-        # out is a list of dicts
-        generated_text = out[0].get('generated_text', '') if out else ''
+        generate = load_generator()
+        generated_text = generate(prompt, max_new_tokens)
 
         print(json.dumps({"generated_text": generated_text}))
         sys.exit(0)
@@ -12,21 +12,161 @@ Features:
 - Progress tracking templates
 """
 
+from __future__ import annotations
+
+import io
 import json
+import mimetypes
 import os
-import shutil
+import sqlite3
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from itertools import repeat
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add parent directory to path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.curriculum.data import SUBJECTS, MATH_GRADE_9_TOPICS, SCIENCE_GRADE_9_TOPICS
-from src.curriculum.models import Subject, Topic, DifficultyLevel
+# The curriculum package is imported lazily (see _topics_index), so listing
+# packs or importing OfflinePack doesn't load the whole curriculum
+if TYPE_CHECKING:
+    from src.curriculum.models import Topic
+
+TEMPLATE_DIR = Path(__file__).parent / "templates" / "offline"
+# Identical in every pack, so read and encoded once
+_STYLES_CSS_BYTES = (TEMPLATE_DIR / "styles.css").read_bytes()
+# MathJax 3 (es5/tex-mml-chtml.js) bundled into every pack when it has been
+# downloaded here, so formulas render without a network connection. Without
+# it the pages fall back to the CDN copy.
+MATHJAX_VENDOR_PATH = TEMPLATE_DIR / "vendor" / "mathjax.js"
+_MATHJAX_BYTES = MATHJAX_VENDOR_PATH.read_bytes() if MATHJAX_VENDOR_PATH.exists() else None
+
+# The pages are small HTML/CSS files that compress nearly as well at level 1
+# as at zlib's default level 6, for a fraction of the CPU time.
+ZIP_COMPRESSLEVEL = 1
+ZIP_WRITE_BUFFER_SIZE = 128 * 1024
+# Cache of pack metadata kept in the output directory by list_available_packs
+PACK_INDEX_FILE = "_pack_index.json"
+# Fixed entry timestamp: skips a localtime() call per file and makes packs
+# with the same content byte-for-byte reproducible
+ZIP_ENTRY_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+# Below this many topics, process start-up costs more than rendering serially
+PARALLEL_TOPIC_THRESHOLD = 8
+# Threads reading metadata.json from uncached packs in list_available_packs;
+# the reads are small and I/O bound, so they overlap well despite the GIL
+PACK_SCAN_WORKERS = 8
+
+# UI strings per pack language; "both" packs use the English chrome
+_LABELS = {
+    "en": {
+        "back": "Back",
+        "grade": "Grade",
+        "pack_subtitle": "Offline Learning Pack",
+        "topics": "Topics",
+        "practice": "Practice",
+        "reference": "Reference",
+        "progress": "Progress",
+        "overview": "Overview",
+        "difficulty": "Difficulty",
+        "objectives": "Learning Objectives",
+        "prerequisites": "Prerequisites",
+        "content": "Content",
+        "content_soon": "Detailed content coming soon...",
+        "see_textbook": "Please refer to your PCTB textbook",
+        "practice_questions": "Practice Questions",
+        "practice_instructions": 'Read each question carefully and solve. Click "Show Answer" to check your solution.',
+        "question": "Q",
+        "show_answer": "Show Answer",
+        "answer_soon": "Answer coming soon...",
+        "questions_soon": "Questions coming soon...",
+        "quick_reference": "Quick Reference",
+        "print": "Print",
+        "concepts_soon": "Key concepts coming soon...",
+        "progress_tracker": "Progress Tracker",
+        "completed": "Completed",
+        "topic": "Topic",
+        "read": "Read",
+        "mastered": "Mastered",
+        "notes": "Notes",
+        "save_progress": "Save Progress",
+        "load_progress": "Load Progress",
+        "progress_saved": "Progress saved!",
+    },
+    "ur": {
+        "back": "واپس",
+        "grade": "جماعت",
+        "pack_subtitle": "آف لائن تعلیمی پیکج",
+        "topics": "عنوانات",
+        "practice": "مشق",
+        "reference": "حوالہ",
+        "progress": "پیش رفت",
+        "overview": "جائزہ",
+        "difficulty": "مشکل کی سطح",
+        "objectives": "سیکھنے کے مقاصد",
+        "prerequisites": "پیشگی ضروریات",
+        "content": "مواد",
+        "content_soon": "تفصیلی مواد جلد آ رہا ہے...",
+        "see_textbook": "براہ کرم اپنی PCTB نصابی کتاب دیکھیں",
+        "practice_questions": "مشق کے سوالات",
+        "practice_instructions": 'ہر سوال کو احتیاط سے پڑھیں اور حل کریں۔ جوابات چیک کرنے کے لیے "جواب دیکھیں" پر کلک کریں۔',
+        "question": "سوال",
+        "show_answer": "جواب دیکھیں",
+        "answer_soon": "جواب جلد آ رہا ہے...",
+        "questions_soon": "سوالات جلد آ رہے ہیں...",
+        "quick_reference": "فوری حوالہ",
+        "print": "پرنٹ کریں",
+        "concepts_soon": "کلیدی تصورات جلد آ رہے ہیں...",
+        "progress_tracker": "پیش رفت ٹریکر",
+        "completed": "مکمل",
+        "topic": "عنوان",
+        "read": "پڑھا",
+        "mastered": "مہارت",
+        "notes": "نوٹس",
+        "save_progress": "محفوظ کریں",
+        "load_progress": "لوڈ کریں",
+        "progress_saved": "پیش رفت محفوظ ہو گئی!",
+    },
+}
+_LABELS["both"] = _LABELS["en"]
+
+# Keyed by DifficultyLevel value
+_DIFFICULTY_BADGES = {
+    "beginner": "آسان / Easy",
+    "easy": "آسان / Easy",
+    "medium": "درمیانی / Medium",
+    "hard": "مشکل / Hard",
+    "advanced": "مشکل / Hard",
+}
+
+# The finished badge markup; there is one per difficulty level
+_BADGE_HTML = {
+    value: Markup('<span class="badge {}">{}</span>').format(value, text)
+    for value, text in _DIFFICULTY_BADGES.items()
+}
+
+_SUBJECT_NAMES_UR = {
+    "mathematics": "ریاضی",
+    "science": "سائنس",
+    "english": "انگریزی",
+    "urdu": "اردو",
+}
+
+# Serialized metadata "topics" arrays, keyed by the ids of the topics in the pack
+_TOPICS_JSON_CACHE: Dict[Tuple[str, ...], bytes] = {}
+_TOPICS_JSON_CACHE_SIZE = 32
 
 
 @dataclass
@@ -54,20 +194,155 @@ class OfflinePack:
         }
 
 
+def _localized_ur(obj, attr: str) -> str:
+    """Urdu variant of obj.<attr>, falling back to the English one"""
+    return getattr(obj, f"{attr}_ur", "") or getattr(obj, attr)
+
+
+@dataclass
+class _TopicView:
+    """A topic with its display fields resolved for one pack language"""
+    id: str
+    name: str
+    name_ur: str
+    title: str
+    description: str
+    badge_html: Markup
+    objectives: List[str]
+    prerequisites: List[str]
+
+
+def _topic_view(topic: Topic, language: str) -> _TopicView:
+    """Localize a topic once, so templates don't re-resolve it on every page"""
+    localized = _localized_ur if language == "ur" else getattr
+    return _TopicView(
+        id=topic.id,
+        name=topic.name,
+        name_ur=topic.name_ur,
+        title=localized(topic, "name"),
+        description=localized(topic, "description"),
+        badge_html=_BADGE_HTML[topic.difficulty.value],
+        objectives=[localized(obj, "description") for obj in topic.objectives],
+        prerequisites=topic.prerequisites
+    )
+
+
+def _write_entry(zipf: zipfile.ZipFile, arcname: str, data: bytes):
+    """Add one file to the pack with the fixed timestamp and pack compression"""
+    zinfo = zipfile.ZipInfo(arcname, date_time=ZIP_ENTRY_DATE_TIME)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.external_attr = 0o644 << 16
+    zipf.writestr(zinfo, data, compresslevel=ZIP_COMPRESSLEVEL)
+
+
+def _dumps(obj) -> bytes:
+    """Compact UTF-8 JSON, via orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes):
+    """Parse UTF-8 JSON bytes without decoding them to str first"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _read_pack_meta(zip_path: str) -> Optional[dict]:
+    """metadata.json of a pack zip, or None when the zip has none"""
+    with zipfile.ZipFile(zip_path, 'r') as zipf:
+        try:
+            info = zipf.getinfo('metadata.json')
+        except KeyError:
+            return None
+        return _loads(zipf.read(info))
+
+
+def _topics_json(topics: List[Topic]) -> bytes:
+    """JSON array describing the pack's topics; the curriculum is static, so it is cached"""
+    key = tuple(t.id for t in topics)
+    fragment = _TOPICS_JSON_CACHE.get(key)
+    if fragment is None:
+        if len(_TOPICS_JSON_CACHE) >= _TOPICS_JSON_CACHE_SIZE:
+            _TOPICS_JSON_CACHE.clear()
+        fragment = _TOPICS_JSON_CACHE[key] = _dumps([
+            {
+                "id": t.id,
+                "name": t.name,
+                "name_ur": t.name_ur,
+                "difficulty": t.difficulty.value
+            }
+            for t in topics
+        ])
+    return fragment
+
+
+@lru_cache(maxsize=None)
+def _topics_index() -> Dict[Tuple[str, int], List[Topic]]:
+    """Curriculum topics by (subject, grade), imported on first use"""
+    from src.curriculum.data import MATH_GRADE_9_TOPICS, SCIENCE_GRADE_9_TOPICS
+    
+    return {
+        ("mathematics", 9): MATH_GRADE_9_TOPICS,
+        ("science", 9): SCIENCE_GRADE_9_TOPICS,
+    }
+
+
+@lru_cache(maxsize=None)
+def _template_env(template_dir: str, language: str) -> Environment:
+    """Jinja environment for one pack language, shared by all generators.
+
+    The language and its labels are bound into the environment once, so
+    templates are compiled per language and renders don't re-check the
+    language for every string.
+    """
+    env = Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=select_autoescape(["html", "html.j2"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+        cache_size=400,
+    )
+    env.globals["language"] = language
+    env.globals["labels"] = _LABELS[language]
+    env.globals["html_attrs"] = Markup('lang="{}" dir="{}"').format(
+        language, "rtl" if language == "ur" else "ltr"
+    )
+    env.globals["local_mathjax"] = _MATHJAX_BYTES is not None
+    return env
+
+
+def _render_topic_page(template_dir: str, topic: _TopicView, language: str) -> Tuple[str, bytes]:
+    """Render one topic page to (arcname, bytes); module-level so worker processes can run it"""
+    template = _template_env(template_dir, language).get_template("topic.html.j2")
+    html_content = template.render(topic=topic)
+    return f"topics/{topic.id}.html", html_content.encode("utf-8")
+
+
 class OfflinePackGenerator:
     """Generates offline learning packs for download"""
     
     def __init__(self, output_dir: str = "data/offline_packs"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.template_dir = Path(__file__).parent / "templates" / "offline"
+        self.template_dir = TEMPLATE_DIR
+        self._pack_cache = self._load_pack_index()
         
+    def _render(self, zipf: zipfile.ZipFile, template_name: str, arcname: str, language: str, **context):
+        """Render a cached template straight into the pack archive"""
+        template = _template_env(str(self.template_dir), language).get_template(template_name)
+        html_content = template.render(context)
+        _write_entry(zipf, arcname, html_content.encode("utf-8"))
+    
     def generate_pack(
         self,
         grade: int,
         subject: str,
         language: str = "both",
-        topics: Optional[List[str]] = None
+        topics: Optional[List[str]] = None,
+        sqlite: bool = False
     ) -> OfflinePack:
         """
         Generate an offline learning pack.
@@ -77,787 +352,181 @@ class OfflinePackGenerator:
             subject: Subject name (mathematics, science, english, urdu)
             language: Language preference ('en', 'ur', 'both')
             topics: Specific topics to include (None = all topics)
+            sqlite: Also write the pack as a single SQLite database next to the zip
         
         Returns:
             OfflinePack object with pack details
         """
-        # Create pack ID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Create pack ID; one timestamp is shared by the ID, metadata and result
+        now = datetime.now()
+        created_at = now.isoformat()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         pack_id = f"{subject}_grade{grade}_{language}_{timestamp}"
         
-        # Create temporary directory for pack contents
-        temp_dir = self.output_dir / f"temp_{pack_id}"
-        temp_dir.mkdir(parents=True, exist_ok=True)
+        # Get topics for the subject
+        subject_topics = self._get_subject_topics(grade, subject)
         
+        # Filter topics if specified
+        if topics:
+            wanted = set(topics)
+            subject_topics = [t for t in subject_topics if t.id in wanted or t.name in wanted]
+        
+        # Resolve every topic's display text for this language once
+        topic_views = [_topic_view(t, language) for t in subject_topics]
+        
+        # Write every generated file straight into the zip (no temp directory)
+        zip_path = self.output_dir / f"{pack_id}.zip"
         try:
-            # Get topics for the subject
-            subject_topics = self._get_subject_topics(grade, subject)
-            
-            # Filter topics if specified
-            if topics:
-                subject_topics = [t for t in subject_topics if t.id in topics or t.name in topics]
-            
-            # Generate content files
-            self._generate_index_html(temp_dir, subject, grade, subject_topics, language)
-            self._generate_topic_pages(temp_dir, subject_topics, language)
-            self._generate_practice_questions(temp_dir, subject_topics, language)
-            self._generate_quick_reference(temp_dir, subject_topics, language)
-            self._generate_progress_tracker(temp_dir, subject_topics, language)
-            self._generate_styles(temp_dir)
-            
-            # Create metadata
-            self._generate_metadata(temp_dir, pack_id, grade, subject, language, subject_topics)
-            
-            # Create zip file
-            zip_path = self.output_dir / f"{pack_id}.zip"
-            self._create_zip(temp_dir, zip_path)
-            
-            # Get file size
-            size_bytes = zip_path.stat().st_size
-            
-            return OfflinePack(
-                pack_id=pack_id,
-                grade=grade,
-                subject=subject,
-                language=language,
-                topics=[t.name for t in subject_topics],
-                created_at=datetime.now().isoformat(),
-                file_path=str(zip_path),
-                size_bytes=size_bytes
-            )
-            
+            with io.open(zip_path, 'wb', buffering=ZIP_WRITE_BUFFER_SIZE) as fp:
+                with zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL) as zipf:
+                    self._generate_index_html(zipf, subject, grade, topic_views, language)
+                    self._generate_topic_pages(zipf, topic_views, language)
+                    self._generate_practice_questions(zipf, topic_views, language)
+                    self._generate_quick_reference(zipf, topic_views, language)
+                    self._generate_progress_tracker(zipf, topic_views, language)
+                    self._generate_styles(zipf)
+                    self._generate_vendor_scripts(zipf)
+                    
+                    # Create metadata
+                    self._generate_metadata(zipf, pack_id, created_at, grade, subject, language, subject_topics)
+                
+                # The central directory is written on close, so this is the file size
+                size_bytes = fp.tell()
+        except BaseException:
+            # Don't leave a truncated pack behind
+            zip_path.unlink(missing_ok=True)
+            raise
+        
+        if sqlite:
+            self._create_sqlite_pack(zip_path, topic_views)
+        
+        return OfflinePack(
+            pack_id=pack_id,
+            grade=grade,
+            subject=subject,
+            language=language,
+            topics=[t.name for t in subject_topics],
+            created_at=created_at,
+            file_path=str(zip_path),
+            size_bytes=size_bytes
+        )
+    
+    def _create_sqlite_pack(self, zip_path: Path, topics: List[_TopicView]) -> Path:
+        """
+        Copy a generated pack into one SQLite file for low-end devices.
+        
+        Every zip entry becomes a row of assets(path, content, content_type),
+        so a viewer reads one database instead of many small files, and
+        topics_fts is an FTS5 index over the localized topic text.
+        """
+        db_path = zip_path.with_suffix(".sqlite")
+        db_path.unlink(missing_ok=True)
+        
+        with zipfile.ZipFile(zip_path) as zipf:
+            assets = [
+                (
+                    info.filename,
+                    zipf.read(info),
+                    mimetypes.guess_type(info.filename)[0] or "application/octet-stream"
+                )
+                for info in zipf.infolist()
+            ]
+        
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE assets (path TEXT PRIMARY KEY, content BLOB NOT NULL, content_type TEXT NOT NULL)"
+                )
+                conn.executemany("INSERT INTO assets VALUES (?, ?, ?)", assets)
+                try:
+                    conn.execute(
+                        "CREATE VIRTUAL TABLE topics_fts USING fts5(id UNINDEXED, name, description, objectives)"
+                    )
+                except sqlite3.OperationalError:
+                    print("⚠️ SQLite was built without FTS5; skipping the topic search index")
+                else:
+                    conn.executemany(
+                        "INSERT INTO topics_fts VALUES (?, ?, ?, ?)",
+                        [
+                            (
+                                t.id,
+                                t.title,
+                                t.description,
+                                "\n".join(t.objectives)
+                            )
+                            for t in topics
+                        ]
+                    )
+            conn.execute("VACUUM")
         finally:
-            # Cleanup temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            conn.close()
+        
+        return db_path
     
     def _get_subject_topics(self, grade: int, subject: str) -> List[Topic]:
         """Get topics for a subject and grade"""
-        if subject == "mathematics" and grade == 9:
-            return MATH_GRADE_9_TOPICS
-        elif subject == "science" and grade == 9:
-            return SCIENCE_GRADE_9_TOPICS
-        else:
-            # Return empty list for subjects/grades not yet implemented
-            return []
+        # Empty list for subjects/grades not yet implemented
+        return _topics_index().get((subject, grade), [])
     
     def _generate_index_html(
         self,
-        output_dir: Path,
+        zipf: zipfile.ZipFile,
         subject: str,
         grade: int,
-        topics: List[Topic],
+        topics: List[_TopicView],
         language: str
     ):
         """Generate main index.html file"""
-        
-        # Generate topics list
-        topics_html = ""
-        for topic in topics:
-            if language == "ur":
-                title = topic.name_ur or topic.name
-            elif language == "both":
-                title = f"{topic.name} / {topic.name_ur}" if topic.name_ur else topic.name
-            else:
-                title = topic.name
-            
-            difficulty_badge = self._get_difficulty_badge(topic.difficulty)
-            
-            topics_html += f"""
-            <div class="topic-card">
-                <h3><a href="topics/{topic.id}.html">{title}</a></h3>
-                <span class="badge {topic.difficulty.value}">{difficulty_badge}</span>
-                <p class="description">{topic.description if language != 'ur' else (topic.description_ur or topic.description)}</p>
-            </div>
-            """
-        
-        # Determine title based on language
-        if language == "ur":
-            title = f"جماعت {grade} - {self._get_subject_name_ur(subject)}"
-            subtitle = "آف لائن تعلیمی پیکج"
-            nav_topics = "عنوانات"
-            nav_practice = "مشق"
-            nav_reference = "حوالہ"
-            nav_progress = "پیش رفت"
-        else:
-            title = f"Grade {grade} - {subject.title()}"
-            subtitle = "Offline Learning Pack"
-            nav_topics = "Topics"
-            nav_practice = "Practice"
-            nav_reference = "Reference"
-            nav_progress = "Progress"
-        
-        html_content = f"""<!DOCTYPE html>
-<html lang="{language}" dir="{'rtl' if language == 'ur' else 'ltr'}">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - Syncora</title>
-    <link rel="stylesheet" href="styles.css">
-</head>
-<body>
-    <header class="header">
-        <div class="logo">
-            <h1>🎓 Syncora</h1>
-            <p>{subtitle}</p>
-        </div>
-        <nav>
-            <a href="index.html" class="active">{nav_topics}</a>
-            <a href="practice.html">{nav_practice}</a>
-            <a href="reference.html">{nav_reference}</a>
-            <a href="progress.html">{nav_progress}</a>
-        </nav>
-    </header>
-    
-    <main>
-        <section class="hero">
-            <h2>{title}</h2>
-            <p>{len(topics)} topics included</p>
-        </section>
-        
-        <section class="topics-grid">
-            {topics_html}
-        </section>
-    </main>
-    
-    <footer>
-        <p>🇵🇰 Made for Pakistani Students | Punjab Curriculum and Textbook Board (PCTB)</p>
-        <p>Generated by Syncora - EDU TECH Challenge 2025</p>
-    </footer>
-</body>
-</html>
-"""
-        
-        (output_dir / "index.html").write_text(html_content, encoding="utf-8")
-    
-    def _generate_topic_pages(self, output_dir: Path, topics: List[Topic], language: str):
-        """Generate individual topic HTML pages"""
-        topics_dir = output_dir / "topics"
-        topics_dir.mkdir(exist_ok=True)
-        
-        for topic in topics:
-            title = topic.name if language != "ur" else (topic.name_ur or topic.name)
-            description = topic.description if language != "ur" else (topic.description_ur or topic.description)
-            
-            # Generate learning objectives
-            objectives_html = "<ul>"
-            for obj in topic.learning_objectives:
-                obj_text = obj.description if language != "ur" else (obj.description_ur or obj.description)
-                objectives_html += f"<li>{obj_text}</li>"
-            objectives_html += "</ul>"
-            
-            # Generate prerequisites
-            prereq_html = ""
-            if topic.prerequisites:
-                prereq_html = f"""
-                <section class="prerequisites">
-                    <h3>{'پیشگی ضروریات' if language == 'ur' else 'Prerequisites'}</h3>
-                    <ul>
-                        {''.join(f'<li>{p}</li>' for p in topic.prerequisites)}
-                    </ul>
-                </section>
-                """
-            
-            html_content = f"""<!DOCTYPE html>
-<html lang="{language}" dir="{'rtl' if language == 'ur' else 'ltr'}">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - DeepTutor</title>
-    <link rel="stylesheet" href="../styles.css">
-    <script src="https://polyfill.io/v3/polyfill.min.js?features=es6"></script>
-    <script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>
-</head>
-<body>
-    <header class="header">
-        <a href="../index.html" class="back-btn">← {'واپس' if language == 'ur' else 'Back'}</a>
-        <h1>{title}</h1>
-    </header>
+        self._render(
+            zipf,
+            "index.html.j2",
+            "index.html",
+            language=language,
+            subject=subject,
+            subject_name_ur=_SUBJECT_NAMES_UR.get(subject, subject),
+            grade=grade,
+            topics=topics,
+        )
     
-    <main class="topic-content">
-        <section class="overview">
-            <h2>{'جائزہ' if language == 'ur' else 'Overview'}</h2>
-            <p>{description}</p>
-            <p class="difficulty">
-                {'مشکل کی سطح' if language == 'ur' else 'Difficulty'}: 
-                <span class="badge {topic.difficulty.value}">{self._get_difficulty_badge(topic.difficulty)}</span>
-            </p>
-        </section>
-        
-        <section class="objectives">
-            <h2>{'سیکھنے کے مقاصد' if language == 'ur' else 'Learning Objectives'}</h2>
-            {objectives_html}
-        </section>
-        
-        {prereq_html}
-        
-        <section class="content">
-            <h2>{'مواد' if language == 'ur' else 'Content'}</h2>
-            <div class="placeholder">
-                <p>{'تفصیلی مواد جلد آ رہا ہے...' if language == 'ur' else 'Detailed content coming soon...'}</p>
-                <p>{'براہ کرم اپنی PCTB نصابی کتاب دیکھیں' if language == 'ur' else 'Please refer to your PCTB textbook'}</p>
-            </div>
-        </section>
+    def _generate_topic_pages(self, zipf: zipfile.ZipFile, topics: List[_TopicView], language: str):
+        """Generate individual topic HTML pages, rendering large packs across processes"""
+        args = (repeat(str(self.template_dir)), topics, repeat(language))
+        if len(topics) < PARALLEL_TOPIC_THRESHOLD:
+            pages = map(_render_topic_page, *args)
+        else:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                pages = list(executor.map(_render_topic_page, *args, chunksize=8))
         
-        <section class="practice-link">
-            <a href="../practice.html#{topic.id}" class="btn-primary">
-                {'مشق کے سوالات' if language == 'ur' else 'Practice Questions'} →
-            </a>
-        </section>
-    </main>
-    
-    <footer>
-        <p>🇵🇰 Syncora - PCTB Aligned</p>
-    </footer>
-</body>
-</html>
-"""
-            
-            (topics_dir / f"{topic.id}.html").write_text(html_content, encoding="utf-8")
+        for arcname, data in pages:
+            _write_entry(zipf, arcname, data)
     
-    def _generate_practice_questions(self, output_dir: Path, topics: List[Topic], language: str):
+    def _generate_practice_questions(self, zipf: zipfile.ZipFile, topics: List[_TopicView], language: str):
         """Generate practice questions page"""
-        
-        questions_html = ""
-        for i, topic in enumerate(topics):
-            title = topic.name if language != "ur" else (topic.name_ur or topic.name)
-            
-            # Generate sample questions based on difficulty
-            sample_questions = self._get_sample_questions(topic, language)
-            
-            questions_html += f"""
-            <section class="topic-questions" id="{topic.id}">
-                <h3>{i+1}. {title}</h3>
-                {sample_questions}
-            </section>
-            """
-        
-        html_content = f"""<!DOCTYPE html>
-<html lang="{language}" dir="{'rtl' if language == 'ur' else 'ltr'}">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{'مشق کے سوالات' if language == 'ur' else 'Practice Questions'} - DeepTutor</title>
-    <link rel="stylesheet" href="styles.css">
-    <script src="https://polyfill.io/v3/polyfill.min.js?features=es6"></script>
-    <script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>
-</head>
-<body>
-    <header class="header">
-        <a href="index.html" class="back-btn">← {'واپس' if language == 'ur' else 'Back'}</a>
-        <h1>{'مشق کے سوالات' if language == 'ur' else 'Practice Questions'}</h1>
-    </header>
-    
-    <main class="practice-content">
-        <div class="instructions">
-            <p>{'ہر سوال کو احتیاط سے پڑھیں اور حل کریں۔ جوابات چیک کرنے کے لیے "جواب دیکھیں" پر کلک کریں۔' if language == 'ur' else 'Read each question carefully and solve. Click "Show Answer" to check your solution.'}</p>
-        </div>
-        
-        {questions_html}
-    </main>
-    
-    <script>
-        function toggleAnswer(id) {{
-            const answer = document.getElementById(id);
-            if (answer.style.display === 'none' || answer.style.display === '') {{
-                answer.style.display = 'block';
-            }} else {{
-                answer.style.display = 'none';
-            }}
-        }}
-    </script>
-    
-    <footer>
-        <p>🇵🇰 DeepTutor - Practice makes perfect!</p>
-    </footer>
-</body>
-</html>
-"""
-        
-        (output_dir / "practice.html").write_text(html_content, encoding="utf-8")
+        self._render(zipf, "practice.html.j2", "practice.html", language=language, topics=topics)
     
-    def _generate_quick_reference(self, output_dir: Path, topics: List[Topic], language: str):
+    def _generate_quick_reference(self, zipf: zipfile.ZipFile, topics: List[_TopicView], language: str):
         """Generate quick reference page with formulas and key concepts"""
-        
-        reference_html = ""
-        for topic in topics:
-            title = topic.name if language != "ur" else (topic.name_ur or topic.name)
-            
-            # Get key formulas/concepts based on topic
-            key_concepts = self._get_key_concepts(topic, language)
-            
-            reference_html += f"""
-            <section class="reference-section">
-                <h3>{title}</h3>
-                {key_concepts}
-            </section>
-            """
-        
-        html_content = f"""<!DOCTYPE html>
-<html lang="{language}" dir="{'rtl' if language == 'ur' else 'ltr'}">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{'فوری حوالہ' if language == 'ur' else 'Quick Reference'} - DeepTutor</title>
-    <link rel="stylesheet" href="styles.css">
-    <script src="https://polyfill.io/v3/polyfill.min.js?features=es6"></script>
-    <script id="MathJax-script" async src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-chtml.js"></script>
-</head>
-<body>
-    <header class="header">
-        <a href="index.html" class="back-btn">← {'واپس' if language == 'ur' else 'Back'}</a>
-        <h1>{'فوری حوالہ' if language == 'ur' else 'Quick Reference'}</h1>
-    </header>
+        self._render(zipf, "reference.html.j2", "reference.html", language=language, topics=topics)
     
-    <main class="reference-content">
-        <div class="print-btn">
-            <button onclick="window.print()">🖨️ {'پرنٹ کریں' if language == 'ur' else 'Print'}</button>
-        </div>
-        
-        {reference_html}
-    </main>
-    
-    <footer>
-        <p>🇵🇰 DeepTutor - Your quick reference guide</p>
-    </footer>
-</body>
-</html>
-"""
-        
-        (output_dir / "reference.html").write_text(html_content, encoding="utf-8")
-    
-    def _generate_progress_tracker(self, output_dir: Path, topics: List[Topic], language: str):
+    def _generate_progress_tracker(self, zipf: zipfile.ZipFile, topics: List[_TopicView], language: str):
         """Generate progress tracking page"""
-        
-        topics_rows = ""
-        for i, topic in enumerate(topics):
-            title = topic.name if language != "ur" else (topic.name_ur or topic.name)
-            topics_rows += f"""
-            <tr>
-                <td>{i+1}</td>
-                <td>{title}</td>
-                <td><input type="checkbox" id="read_{topic.id}"></td>
-                <td><input type="checkbox" id="practice_{topic.id}"></td>
-                <td><input type="checkbox" id="mastered_{topic.id}"></td>
-                <td><input type="text" placeholder="{'نوٹس' if language == 'ur' else 'Notes'}"></td>
-            </tr>
-            """
-        
-        html_content = f"""<!DOCTYPE html>
-<html lang="{language}" dir="{'rtl' if language == 'ur' else 'ltr'}">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{'پیش رفت ٹریکر' if language == 'ur' else 'Progress Tracker'} - DeepTutor</title>
-    <link rel="stylesheet" href="styles.css">
-</head>
-<body>
-    <header class="header">
-        <a href="index.html" class="back-btn">← {'واپس' if language == 'ur' else 'Back'}</a>
-        <h1>{'پیش رفت ٹریکر' if language == 'ur' else 'Progress Tracker'}</h1>
-    </header>
-    
-    <main class="progress-content">
-        <div class="stats">
-            <div class="stat-card">
-                <span id="completed-count">0</span>
-                <label>{'مکمل' if language == 'ur' else 'Completed'}</label>
-            </div>
-            <div class="stat-card">
-                <span id="progress-percent">0%</span>
-                <label>{'پیش رفت' if language == 'ur' else 'Progress'}</label>
-            </div>
-        </div>
-        
-        <table class="progress-table">
-            <thead>
-                <tr>
-                    <th>#</th>
-                    <th>{'عنوان' if language == 'ur' else 'Topic'}</th>
-                    <th>{'پڑھا' if language == 'ur' else 'Read'}</th>
-                    <th>{'مشق' if language == 'ur' else 'Practice'}</th>
-                    <th>{'مہارت' if language == 'ur' else 'Mastered'}</th>
-                    <th>{'نوٹس' if language == 'ur' else 'Notes'}</th>
-                </tr>
-            </thead>
-            <tbody>
-                {topics_rows}
-            </tbody>
-        </table>
-        
-        <div class="actions">
-            <button onclick="saveProgress()" class="btn-primary">
-                💾 {'محفوظ کریں' if language == 'ur' else 'Save Progress'}
-            </button>
-            <button onclick="loadProgress()" class="btn-secondary">
-                📂 {'لوڈ کریں' if language == 'ur' else 'Load Progress'}
-            </button>
-        </div>
-    </main>
-    
-    <script>
-        function saveProgress() {{
-            const checkboxes = document.querySelectorAll('input[type="checkbox"]');
-            const inputs = document.querySelectorAll('input[type="text"]');
-            const data = {{}};
-            
-            checkboxes.forEach(cb => data[cb.id] = cb.checked);
-            inputs.forEach(input => data[input.placeholder] = input.value);
-            
-            localStorage.setItem('syncora_progress', JSON.stringify(data));
-            alert('{'پیش رفت محفوظ ہو گئی!' if language == 'ur' else 'Progress saved!'}');
-            updateStats();
-        }}
-        
-        function loadProgress() {{
-            const data = JSON.parse(localStorage.getItem('syncora_progress') || '{{}}');
-            Object.keys(data).forEach(key => {{
-                const element = document.getElementById(key);
-                if (element) {{
-                    if (element.type === 'checkbox') {{
-                        element.checked = data[key];
-                    }} else {{
-                        element.value = data[key];
-                    }}
-                }}
-            }});
-            updateStats();
-        }}
-        
-        function updateStats() {{
-            const mastered = document.querySelectorAll('input[id^="mastered_"]:checked').length;
-            const total = document.querySelectorAll('input[id^="mastered_"]').length;
-            document.getElementById('completed-count').textContent = mastered;
-            document.getElementById('progress-percent').textContent = Math.round((mastered / total) * 100) + '%';
-        }}
-        
-        // Load on page load
-        document.addEventListener('DOMContentLoaded', loadProgress);
-        
-        // Update stats on checkbox change
-        document.querySelectorAll('input[type="checkbox"]').forEach(cb => {{
-            cb.addEventListener('change', updateStats);
-        }});
-    </script>
-    
-    <footer>
-        <p>🇵🇰 DeepTutor - Track your learning journey!</p>
-    </footer>
-</body>
-</html>
-"""
-        
-        (output_dir / "progress.html").write_text(html_content, encoding="utf-8")
-    
-    def _generate_styles(self, output_dir: Path):
-        """Generate CSS stylesheet"""
-        
-        css_content = """
-/* DeepTutor Offline Pack Styles */
-
-:root {
-    --primary-color: #01411C;  /* Pakistan Green */
-    --secondary-color: #FFFFFF;
-    --accent-color: #FFD700;
-    --text-color: #333;
-    --bg-color: #f5f5f5;
-    --card-bg: #ffffff;
-    --border-radius: 8px;
-}
-
-* {
-    margin: 0;
-    padding: 0;
-    box-sizing: border-box;
-}
-
-body {
-    font-family: 'Segoe UI', 'Jameel Noori Nastaleeq', sans-serif;
-    background-color: var(--bg-color);
-    color: var(--text-color);
-    line-height: 1.6;
-}
-
-[dir="rtl"] {
-    font-family: 'Jameel Noori Nastaleeq', 'Noto Nastaliq Urdu', 'Segoe UI', serif;
-}
-
-.header {
-    background: linear-gradient(135deg, var(--primary-color), #006400);
-    color: white;
-    padding: 1rem 2rem;
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    flex-wrap: wrap;
-}
-
-.header h1 {
-    font-size: 1.5rem;
-}
-
-.header nav a {
-    color: white;
-    text-decoration: none;
-    margin: 0 1rem;
-    padding: 0.5rem 1rem;
-    border-radius: var(--border-radius);
-    transition: background 0.3s;
-}
-
-.header nav a:hover,
-.header nav a.active {
-    background: rgba(255,255,255,0.2);
-}
-
-.back-btn {
-    color: white;
-    text-decoration: none;
-    padding: 0.5rem 1rem;
-    background: rgba(255,255,255,0.2);
-    border-radius: var(--border-radius);
-}
-
-main {
-    max-width: 1200px;
-    margin: 0 auto;
-    padding: 2rem;
-}
-
-.hero {
-    text-align: center;
-    padding: 2rem;
-    background: var(--card-bg);
-    border-radius: var(--border-radius);
-    margin-bottom: 2rem;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-}
-
-.topics-grid {
-    display: grid;
-    grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
-    gap: 1.5rem;
-}
-
-.topic-card {
-    background: var(--card-bg);
-    padding: 1.5rem;
-    border-radius: var(--border-radius);
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    transition: transform 0.3s, box-shadow 0.3s;
-}
-
-.topic-card:hover {
-    transform: translateY(-5px);
-    box-shadow: 0 5px 20px rgba(0,0,0,0.15);
-}
-
-.topic-card h3 a {
-    color: var(--primary-color);
-    text-decoration: none;
-}
-
-.badge {
-    display: inline-block;
-    padding: 0.25rem 0.75rem;
-    border-radius: 20px;
-    font-size: 0.8rem;
-    font-weight: bold;
-}
-
-.badge.beginner { background: #4CAF50; color: white; }
-.badge.intermediate { background: #FF9800; color: white; }
-.badge.advanced { background: #f44336; color: white; }
-
-.description {
-    margin-top: 0.5rem;
-    color: #666;
-    font-size: 0.9rem;
-}
-
-/* Topic Page Styles */
-.topic-content {
-    background: var(--card-bg);
-    padding: 2rem;
-    border-radius: var(--border-radius);
-}
-
-.topic-content section {
-    margin-bottom: 2rem;
-}
-
-.topic-content h2 {
-    color: var(--primary-color);
-    border-bottom: 2px solid var(--primary-color);
-    padding-bottom: 0.5rem;
-    margin-bottom: 1rem;
-}
-
-.placeholder {
-    text-align: center;
-    padding: 2rem;
-    background: var(--bg-color);
-    border-radius: var(--border-radius);
-}
-
-.btn-primary {
-    display: inline-block;
-    background: var(--primary-color);
-    color: white;
-    padding: 1rem 2rem;
-    border-radius: var(--border-radius);
-    text-decoration: none;
-    font-weight: bold;
-    transition: background 0.3s;
-    border: none;
-    cursor: pointer;
-}
-
-.btn-primary:hover {
-    background: #006400;
-}
-
-.btn-secondary {
-    display: inline-block;
-    background: #666;
-    color: white;
-    padding: 1rem 2rem;
-    border-radius: var(--border-radius);
-    text-decoration: none;
-    font-weight: bold;
-    transition: background 0.3s;
-    border: none;
-    cursor: pointer;
-}
-
-/* Practice Questions */
-.practice-content {
-    background: var(--card-bg);
-    padding: 2rem;
-    border-radius: var(--border-radius);
-}
-
-.topic-questions {
-    margin-bottom: 2rem;
-    padding-bottom: 2rem;
-    border-bottom: 1px solid #ddd;
-}
-
-.question-item {
-    background: var(--bg-color);
-    padding: 1rem;
-    margin: 1rem 0;
-    border-radius: var(--border-radius);
-}
-
-.answer {
-    display: none;
-    background: #e8f5e9;
-    padding: 1rem;
-    margin-top: 0.5rem;
-    border-radius: var(--border-radius);
-    border-left: 4px solid var(--primary-color);
-}
-
-/* Progress Tracker */
-.stats {
-    display: flex;
-    gap: 2rem;
-    margin-bottom: 2rem;
-}
-
-.stat-card {
-    background: var(--card-bg);
-    padding: 1.5rem 2rem;
-    border-radius: var(--border-radius);
-    text-align: center;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-}
-
-.stat-card span {
-    display: block;
-    font-size: 2rem;
-    font-weight: bold;
-    color: var(--primary-color);
-}
-
-.progress-table {
-    width: 100%;
-    border-collapse: collapse;
-    background: var(--card-bg);
-}
-
-.progress-table th,
-.progress-table td {
-    padding: 1rem;
-    border: 1px solid #ddd;
-    text-align: center;
-}
-
-.progress-table th {
-    background: var(--primary-color);
-    color: white;
-}
-
-.progress-table input[type="text"] {
-    width: 100%;
-    padding: 0.5rem;
-    border: 1px solid #ddd;
-    border-radius: 4px;
-}
-
-.actions {
-    margin-top: 2rem;
-    display: flex;
-    gap: 1rem;
-}
-
-/* Footer */
-footer {
-    text-align: center;
-    padding: 2rem;
-    color: #666;
-    border-top: 1px solid #ddd;
-    margin-top: 2rem;
-}
-
-/* Print Styles */
-@media print {
-    .header nav, .actions, .print-btn, button {
-        display: none;
-    }
+        self._render(zipf, "progress.html.j2", "progress.html", language=language, topics=topics)
     
-    .reference-content {
-        padding: 0;
-    }
-}
-
-/* Mobile Responsive */
-@media (max-width: 768px) {
-    .header {
-        flex-direction: column;
-        text-align: center;
-    }
+    def _generate_styles(self, zipf: zipfile.ZipFile):
+        """Add the shared CSS stylesheet"""
+        _write_entry(zipf, "styles.css", _STYLES_CSS_BYTES)
     
-    .header nav {
-        margin-top: 1rem;
-    }
-    
-    .topics-grid {
-        grid-template-columns: 1fr;
-    }
-    
-    .stats {
-        flex-direction: column;
-    }
-}
-"""
-        
-        (output_dir / "styles.css").write_text(css_content, encoding="utf-8")
+    def _generate_vendor_scripts(self, zipf: zipfile.ZipFile):
+        """Bundle MathJax into the pack when a local copy is available"""
+        if _MATHJAX_BYTES is not None:
+            _write_entry(zipf, "vendor/mathjax.js", _MATHJAX_BYTES)
     
     def _generate_metadata(
         self,
-        output_dir: Path,
+        zipf: zipfile.ZipFile,
         pack_id: str,
+        created_at: str,
         grade: int,
         subject: str,
         language: str,
@@ -869,115 +538,110 @@ footer {
             "pack_id": pack_id,
             "version": "1.0.0",
             "generator": "DeepTutor Offline Pack Generator",
-            "created_at": datetime.now().isoformat(),
+            "created_at": created_at,
             "curriculum_board": "PCTB",
             "grade": grade,
             "subject": subject,
             "language": language,
-            "topics_count": len(topics),
-            "topics": [
-                {
-                    "id": t.id,
-                    "name": t.name,
-                    "name_ur": t.name_ur,
-                    "difficulty": t.difficulty.value
-                }
-                for t in topics
-            ]
+            "topics_count": len(topics)
         }
         
-        (output_dir / "metadata.json").write_text(
-            json.dumps(metadata, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
-    
-    def _create_zip(self, source_dir: Path, zip_path: Path):
-        """Create zip file from source directory"""
-        
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file in source_dir.rglob('*'):
-                if file.is_file():
-                    arcname = file.relative_to(source_dir)
-                    zipf.write(file, arcname)
+        # Splice the cached topics array into the serialized envelope
+        metadata_json = _dumps(metadata)[:-1] + b',"topics":' + _topics_json(topics) + b"}"
+        _write_entry(zipf, "metadata.json", metadata_json)
     
-    def _get_difficulty_badge(self, difficulty: DifficultyLevel) -> str:
-        """Get display text for difficulty level"""
-        badges = {
-            DifficultyLevel.BEGINNER: "آسان / Easy",
-            DifficultyLevel.INTERMEDIATE: "درمیانی / Medium",
-            DifficultyLevel.ADVANCED: "مشکل / Hard"
-        }
-        return badges.get(difficulty, "درمیانی / Medium")
-    
-    def _get_subject_name_ur(self, subject: str) -> str:
-        """Get Urdu name for subject"""
-        names = {
-            "mathematics": "ریاضی",
-            "science": "سائنس",
-            "english": "انگریزی",
-            "urdu": "اردو"
-        }
-        return names.get(subject, subject)
-    
-    def _get_sample_questions(self, topic: Topic, language: str) -> str:
-        """Generate sample questions for a topic"""
-        # Generate basic questions based on learning objectives
-        questions = []
-        
-        for i, obj in enumerate(topic.learning_objectives[:3]):  # Max 3 questions per topic
-            if language == "ur":
-                question_text = obj.description_ur or obj.description
-            else:
-                question_text = obj.description
-            
-            question_id = f"{topic.id}_q{i+1}"
-            questions.append(f"""
-            <div class="question-item">
-                <p><strong>{'سوال' if language == 'ur' else 'Q'} {i+1}:</strong> {question_text}؟</p>
-                <button onclick="toggleAnswer('{question_id}')" class="btn-secondary">
-                    {'جواب دیکھیں' if language == 'ur' else 'Show Answer'}
-                </button>
-                <div class="answer" id="{question_id}">
-                    <p>{'جواب جلد آ رہا ہے...' if language == 'ur' else 'Answer coming soon...'}</p>
-                </div>
-            </div>
-            """)
+    def list_available_packs(self) -> List[dict]:
+        """
+        List all available offline packs.
         
-        return "".join(questions) if questions else f"<p>{'سوالات جلد آ رہے ہیں...' if language == 'ur' else 'Questions coming soon...'}</p>"
-    
-    def _get_key_concepts(self, topic: Topic, language: str) -> str:
-        """Generate key concepts/formulas for a topic"""
-        concepts = []
+        Pack metadata is cached by (mtime, size) in memory and in
+        PACK_INDEX_FILE, so only new or changed zips are opened.
+        """
+        packs = []
+        index = {}
         
-        for obj in topic.learning_objectives:
-            if language == "ur":
-                concept = obj.description_ur or obj.description
+        # scandir hands back names without building a Path per entry, and
+        # DirEntry.is_file needs no extra stat call on most platforms
+        entries = []
+        try:
+            with os.scandir(self.output_dir) as it:
+                for entry in it:
+                    try:
+                        if entry.name.endswith(".zip") and entry.is_file():
+                            entries.append((entry.path, entry.stat()))
+                    except OSError:
+                        continue
+        except FileNotFoundError:
+            pass
+        
+        # Packs that are new or changed since they were cached
+        stale = {
+            key for key, stat in entries
+            if (self._pack_cache.get(key) or ())[:2] != (stat.st_mtime_ns, stat.st_size)
+        }
+        fresh = {}
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(PACK_SCAN_WORKERS, len(stale))) as executor:
+                futures = {key: executor.submit(_read_pack_meta, key) for key in stale}
+            for key, future in futures.items():
+                if future.exception() is None:
+                    fresh[key] = future.result()
+        
+        for key, stat in entries:
+            if key in fresh:
+                metadata = fresh[key]
+            elif key in stale:
+                # Unreadable zip: skipped and left out of the index
+                continue
             else:
-                concept = obj.description
+                metadata = self._pack_cache[key][2]
+            index[key] = (stat.st_mtime_ns, stat.st_size, metadata)
             
-            concepts.append(f"<li>{concept}</li>")
-        
-        if concepts:
-            return f"<ul>{''.join(concepts)}</ul>"
-        else:
-            return f"<p>{'کلیدی تصورات جلد آ رہے ہیں...' if language == 'ur' else 'Key concepts coming soon...'}</p>"
-    
-    def list_available_packs(self) -> List[dict]:
-        """List all available offline packs"""
-        packs = []
+            if metadata is not None:
+                packs.append({**metadata, 'file_path': key, 'size_bytes': stat.st_size})
         
-        for zip_file in self.output_dir.glob("*.zip"):
-            try:
-                with zipfile.ZipFile(zip_file, 'r') as zipf:
-                    if 'metadata.json' in zipf.namelist():
-                        metadata = json.loads(zipf.read('metadata.json').decode('utf-8'))
-                        metadata['file_path'] = str(zip_file)
-                        metadata['size_bytes'] = zip_file.stat().st_size
-                        packs.append(metadata)
-            except Exception:
-                continue
+        if stale or index.keys() != self._pack_cache.keys():
+            self._pack_cache = index
+            self._save_pack_index()
         
         return packs
+    
+    def _load_pack_index(self) -> Dict[str, Tuple[int, int, Optional[dict]]]:
+        """Read the persisted pack metadata cache, if there is a usable one"""
+        try:
+            entries = _loads((self.output_dir / PACK_INDEX_FILE).read_bytes())
+            return {key: tuple(entry) for key, entry in entries.items()}
+        except (OSError, ValueError, AttributeError, TypeError):
+            return {}
+    
+    def _save_pack_index(self):
+        """Persist the pack metadata cache; it is only an optimization, so failures are ignored"""
+        index_path = self.output_dir / PACK_INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(_dumps(self._pack_cache))
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+
+def _generate_one(output_dir: str, config: dict) -> OfflinePack:
+    """Worker entry point for generate_all: build a single pack"""
+    return OfflinePackGenerator(output_dir).generate_pack(**config)
+
+
+def generate_all(configs: List[dict], output_dir: str = "data/offline_packs") -> List[OfflinePack]:
+    """
+    Generate several packs in parallel, one process per pack.
+    
+    Args:
+        configs: generate_pack keyword arguments for each pack
+        output_dir: Directory the packs are written to
+    
+    Returns:
+        OfflinePack objects in the order of configs
+    """
+    with ProcessPoolExecutor(max_workers=min(len(configs), os.cpu_count() or 1) or 1) as executor:
+        return list(executor.map(_generate_one, repeat(output_dir), configs))
 
 
 def main():
@@ -993,6 +657,10 @@ def main():
     parser.add_argument("--output", type=str, default="data/offline_packs",
                        help="Output directory")
     parser.add_argument("--list", action="store_true", help="List available packs")
+    parser.add_argument("--sqlite", action="store_true",
+                       help="Also write each pack as a single SQLite database")
+    parser.add_argument("--all", action="store_true",
+                       help="Generate packs for every available grade, subject and language")
     
     args = parser.parse_args()
     
@@ -1009,12 +677,25 @@ def main():
             print("No offline packs found.")
         return
     
+    if args.all:
+        configs = [
+            {"grade": grade, "subject": subject, "language": language, "sqlite": args.sqlite}
+            for subject, grade in _topics_index()
+            for language in ("en", "ur", "both")
+        ]
+        print(f"🎓 Generating {len(configs)} offline packs...")
+        for pack in generate_all(configs, args.output):
+            size_mb = pack.size_bytes / (1024 * 1024)
+            print(f"  ✅ {pack.pack_id} ({size_mb:.2f} MB)")
+        return
+    
     print(f"🎓 Generating offline pack for Grade {args.grade} {args.subject}...")
     
     pack = generator.generate_pack(
         grade=args.grade,
         subject=args.subject,
-        language=args.language
+        language=args.language,
+        sqlite=args.sqlite
     )
     
     size_mb = pack.size_bytes / (1024 * 1024)
@@ -12,11 +12,23 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import chromadb
 import time
+from functools import lru_cache
+
+MODEL_PATH = project_root / "src" / "agents" / "rag_system" / "models" / "all-MiniLM-L6-v2"
+
+
+@lru_cache(maxsize=1)
+def _get_model(path: str):
+    """Load the SentenceTransformer once per process."""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(path)
+
 
 def test_chroma_query():
     """Test ChromaDB query operation step by step."""
+    # Imported here so loading this module doesn't pay chromadb's start-up cost
+    import chromadb
     
     print("=" * 60)
     print("ChromaDB Query Test")
@@ -80,12 +92,11 @@ def test_chroma_query():
     print(f"\n[6] Creating dummy query embedding...")
     start = time.time()
     try:
-        from sentence_transformers import SentenceTransformer
-        model_path = project_root / "src" / "agents" / "rag_system" / "models" / "all-MiniLM-L6-v2"
+        model_path = MODEL_PATH
         print(f"    Model path: {model_path}")
         print(f"    Exists: {model_path.exists()}")
         
-        model = SentenceTransformer(str(model_path))
+        model = _get_model(str(model_path))
         print(f"    ✓ Model loaded in {time.time() - start:.2f}s")
         
         query_text = "what is this about?"
@@ -103,35 +114,24 @@ def test_chroma_query():
     
     start = time.time()
     try:
-        # Set a timeout using threading
-        import threading
+        from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
         
-        result_container = {}
-        exception_container = {}
+        # Not used as a context manager: leaving the with-block would wait
+        # for a hung query, defeating the timeout
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(
+            collection.query,
+            query_embeddings=[query_embedding],
+            n_results=3
+        )
+        print(f"    Query submitted, waiting...")
         
-        def query_with_timeout():
-            try:
-                print(f"    [Thread] Starting ChromaDB query...")
-                results = collection.query(
-                    query_embeddings=[query_embedding],
-                    n_results=3
-                )
-                print(f"    [Thread] Query completed!")
-                result_container['results'] = results
-            except Exception as e:
-                print(f"    [Thread] Exception: {e}")
-                exception_container['error'] = e
-        
-        thread = threading.Thread(target=query_with_timeout)
-        thread.daemon = True
-        thread.start()
-        print(f"    Query thread started, waiting...")
-        
-        # Wait with timeout
         timeout = 10  # 10 seconds
-        thread.join(timeout=timeout)
-        
-        if thread.is_alive():
+        try:
+            # Re-raises any exception from the query itself
+            results = future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
             print(f"    ✗ TIMEOUT after {timeout}s - Query is hanging!")
             print(f"    This indicates ChromaDB query is blocking indefinitely.")
             print(f"\n⚠ DIAGNOSIS: ChromaDB query operation is hanging.")
@@ -139,12 +139,11 @@ def test_chroma_query():
             print(f"   1. ChromaDB database corruption")
             print(f"   2. Index not properly built")
             print(f"   3. Threading/locking issue in ChromaDB")
+            print(f"   (The stuck query thread cannot be killed; press Ctrl+C if exit hangs.)")
             return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
-        if 'error' in exception_container:
-            raise exception_container['error']
-        
-        results = result_container.get('results')
         elapsed = time.time() - start
         
         print(f"    ✓ Query completed in {elapsed:.2f}s")
@@ -13,7 +13,7 @@ from src.agents.agentic_system.tutor_agent import TutorAgent
 from src.agents.agentic_system.language_agent import LanguageAgent
 from src.agents.agentic_system.safety_agent import SafetyAgent
 from src.agents.agentic_system.learning_path_agent import LearningPathAgent
-from src.agents.agentic_system.orchestrator import AgentOrchestrator
+from src.agents.agentic_system.orchestrator import AgentOrchestrator, get_orchestrator
 
 __all__ = [
     "StudentProfiler",
@@ -23,4 +23,5 @@ __all__ = [
     "SafetyAgent",
     "LearningPathAgent",
     "AgentOrchestrator",
+    "get_orchestrator",
 ]
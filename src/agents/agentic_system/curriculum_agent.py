@@ -7,9 +7,31 @@ Ensures all learning material is aligned with syllabus.
 """
 
 import json
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Curriculum files are small; a few threads are enough to overlap their reads
+MAX_LOAD_WORKERS = 8
+
+
+def _read_curriculum_file(file_path: Path) -> Dict[str, Any]:
+    """Parse one curriculum file; orjson reads it straight from a read-only mmap."""
+    if orjson is None:
+        return json.loads(file_path.read_bytes())
+    
+    # Parsing from the mapping skips copying the file into a bytes object;
+    # the pages come from (and stay in) the OS page cache across reloads
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
 
 class CurriculumAgent:
     """Manages curriculum data and ensures content alignment."""
@@ -20,18 +42,57 @@ class CurriculumAgent:
         self._load_curriculum_index()
 
     def _load_curriculum_index(self):
-        """Load all curriculum files into index."""
+        """Load all curriculum files into index, plus flat per-curriculum topic lookups."""
         self.curriculum_index = {}
-        for file_path in self.curriculum_dir.glob("*.json"):
+        # grade -> {"grade_subject": curriculum}, in load order
+        self._curricula_by_grade: Dict[str, Dict[str, Any]] = {}
+        # "grade_subject" -> {lowercase topic name: (topic, chapter name)}
+        self._topic_index: Dict[str, Dict[str, tuple]] = {}
+        # "grade_subject" -> every topic, in chapter order
+        self._topics_by_key: Dict[str, List[Dict[str, Any]]] = {}
+        # Per curriculum, keyed by position in _topics_by_key: lowercase names
+        # and a trigram -> positions inverted index
+        self._topic_names_lower: Dict[str, List[str]] = {}
+        self._topic_trigrams: Dict[str, Dict[str, set]] = {}
+        paths = list(self.curriculum_dir.glob("*.json"))
+        if not paths:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(paths))) as executor:
+            futures = [(file_path, executor.submit(_read_curriculum_file, file_path)) for file_path in paths]
+        
+        for file_path, future in futures:
             try:
-                data = json.loads(file_path.read_text(encoding="utf-8"))
+                data = future.result()
                 grade = data.get("grade")
                 subject = data.get("subject")
                 key = f"{grade}_{subject}"
                 self.curriculum_index[key] = data
+                self._curricula_by_grade.setdefault(str(grade), {})[key] = data
+                self._index_topics(key, data)
             except Exception as e:
                 print(f"Error loading curriculum file {file_path}: {e}")
 
+    def _index_topics(self, key: str, curriculum: Dict[str, Any]):
+        """Flatten a curriculum's chapters into O(1) topic lookups."""
+        by_name = {}
+        topics = []
+        names = []
+        trigrams = {}
+        for chapter in curriculum.get("chapters", []):
+            for t in chapter.get("topics", []):
+                name = t.get("name", "").lower()
+                # First match wins, as with the chapter-by-chapter scan
+                by_name.setdefault(name, (t, chapter.get("name")))
+                for i in range(len(name) - 2):
+                    trigrams.setdefault(name[i:i + 3], set()).add(len(topics))
+                topics.append(t)
+                names.append(name)
+        self._topic_index[key] = by_name
+        self._topics_by_key[key] = topics
+        self._topic_names_lower[key] = names
+        self._topic_trigrams[key] = trigrams
+
     def get_curriculum_for_student(
         self,
         grade: str,
@@ -44,10 +105,7 @@ class CurriculumAgent:
             return self.curriculum_index.get(key, {})
         
         # Return all subjects for grade
-        return {
-            k: v for k, v in self.curriculum_index.items()
-            if k.startswith(f"{grade}_")
-        }
+        return dict(self._curricula_by_grade.get(str(grade), {}))
 
     def get_topic_content(
         self,
@@ -56,27 +114,26 @@ class CurriculumAgent:
         topic: str,
     ) -> Dict[str, Any]:
         """Get detailed content for a specific topic."""
-        curriculum = self.get_curriculum_for_student(grade, subject=subject)
-        if not curriculum:
+        match = self._topic_index.get(f"{grade}_{subject}", {}).get(topic.lower())
+        if match is None:
             return {}
         
-        chapters = curriculum.get("chapters", [])
-        for chapter in chapters:
-            topics = chapter.get("topics", [])
-            for t in topics:
-                if t.get("name", "").lower() == topic.lower():
-                    return {
-                        "topic": t.get("name"),
-                        "chapter": chapter.get("name"),
-                        "explanation": t.get("explanation"),
-                        "examples": t.get("examples", []),
-                        "difficulty": t.get("difficulty", "medium"),
-                        "estimatedTime": t.get("estimatedTime"),
-                        "objectives": t.get("objectives", []),
-                        "prerequisites": t.get("prerequisites", []),
-                    }
-        
-        return {}
+        t, chapter_name = match
+        return {
+            "topic": t.get("name"),
+            "chapter": chapter_name,
+            "explanation": t.get("explanation"),
+            "examples": t.get("examples", []),
+            "difficulty": t.get("difficulty", "medium"),
+            "estimatedTime": t.get("estimatedTime"),
+            "objectives": t.get("objectives", []),
+            "prerequisites": t.get("prerequisites", []),
+        }
+
+    def _find_topic(self, grade: str, subject: str, topic: str) -> Dict[str, Any]:
+        """Raw topic dict from the index, or {} when it isn't in the curriculum."""
+        match = self._topic_index.get(f"{grade}_{subject}", {}).get(topic.lower())
+        return match[0] if match is not None else {}
 
     def validate_content(
         self,
@@ -128,8 +185,7 @@ class CurriculumAgent:
         topic: str,
     ) -> List[str]:
         """Get learning objectives for a topic."""
-        content = self.get_topic_content(grade, subject, topic)
-        return content.get("objectives", [])
+        return self._find_topic(grade, subject, topic).get("objectives", [])
 
     def get_similar_topics(
         self,
@@ -137,22 +193,32 @@ class CurriculumAgent:
         subject: str,
         topic: str,
     ) -> List[str]:
-        """Get similar topics for reinforcement."""
-        curriculum = self.get_curriculum_for_student(grade, subject=subject)
-        if not curriculum:
+        """Get similar topics (names containing, or contained in, the topic) for reinforcement."""
+        key = f"{grade}_{subject}"
+        topics = self._topics_by_key.get(key)
+        if not topics:
             return []
         
-        chapters = curriculum.get("chapters", [])
-        similar = []
+        query = topic.lower()
+        names = self._topic_names_lower[key]
         
-        for chapter in chapters:
-            for t in chapter.get("topics", []):
-                topic_name = t.get("name", "").lower()
-                if topic.lower() in topic_name or topic_name in topic.lower():
-                    if t.get("name") != topic:
-                        similar.append(t.get("name"))
+        # Names containing the query: they must hold every trigram of it
+        if len(query) >= 3:
+            trigrams = self._topic_trigrams[key]
+            postings = sorted(
+                (trigrams.get(query[i:i + 3], set()) for i in range(len(query) - 2)),
+                key=len,
+            )
+            hits = {i for i in set.intersection(*postings) if query in names[i]}
+        else:
+            hits = {i for i, name in enumerate(names) if query in name}
+        
+        # Names contained in the query: one substring test per name, linear
+        # in the query's length (looking up its substrings would be quadratic)
+        hits.update(i for i, name in enumerate(names) if name in query)
         
-        return similar[:5]  # Return top 5
+        similar = [topics[i].get("name") for i in sorted(hits) if topics[i].get("name") != topic]
+        return similar[:5]  # Return top 5, in curriculum order
 
     def get_prerequisites(
         self,
@@ -161,8 +227,7 @@ class CurriculumAgent:
         topic: str,
     ) -> List[str]:
         """Get prerequisite topics for a topic."""
-        content = self.get_topic_content(grade, subject, topic)
-        return content.get("prerequisites", [])
+        return self._find_topic(grade, subject, topic).get("prerequisites", [])
 
     def check_prerequisite_mastery(
         self,
@@ -174,19 +239,17 @@ class CurriculumAgent:
         """Check if student has mastered prerequisites."""
         prerequisites = self.get_prerequisites(grade, subject, topic)
         
-        mastered = []
-        notMastered = []
-        
-        for prereq in prerequisites:
-            mastery_level = studentMastery.get(prereq, 0)
-            if mastery_level >= 70:
-                mastered.append(prereq)
-            else:
-                notMastered.append({
-                    "topic": prereq,
-                    "currentMastery": mastery_level,
-                    "required": 70,
-                })
+        levels = [(prereq, studentMastery.get(prereq, 0)) for prereq in prerequisites]
+        mastered = [prereq for prereq, mastery_level in levels if mastery_level >= 70]
+        notMastered = [
+            {
+                "topic": prereq,
+                "currentMastery": mastery_level,
+                "required": 70,
+            }
+            for prereq, mastery_level in levels
+            if mastery_level < 70
+        ]
         
         return {
             "canProceed": len(notMastered) == 0,
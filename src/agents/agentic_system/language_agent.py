@@ -6,8 +6,112 @@ Handles translation and language-specific content generation.
 Supports English, Urdu, and Roman Urdu.
 """
 
+import re
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
+# Urdu is written in the Arabic script block
+URDU_SCRIPT_RE = re.compile(r"[\u0600-\u06FF]")
+
+# Common Roman Urdu words, matched anywhere in the input in a single pass
+ROMAN_URDU_PATTERNS = [
+    "kya", "hai", "acha", "bilkul", "theek", "phir",
+    "seekh", "soch", "likh", "sunn", "pooch"
+]
+ROMAN_URDU_RE = re.compile("|".join(map(re.escape, ROMAN_URDU_PATTERNS)), re.IGNORECASE)
+
+# Static lookup tables, shared read-only by every LanguageAgent
+TRANSLATIONS = MappingProxyType({
+    "hello": {"en": "Hello", "ur": "السلام علیکم", "ur_roman": "Assalamu Alaikum"},
+    "what": {"en": "What", "ur": "کیا", "ur_roman": "Kya"},
+    "how": {"en": "How", "ur": "کیسے", "ur_roman": "Kaise"},
+    "why": {"en": "Why", "ur": "کیوں", "ur_roman": "Kyun"},
+    "when": {"en": "When", "ur": "کب", "ur_roman": "Kab"},
+    "where": {"en": "Where", "ur": "کہاں", "ur_roman": "Kahan"},
+    "question": {"en": "Question", "ur": "سوال", "ur_roman": "Sawal"},
+    "answer": {"en": "Answer", "ur": "جواب", "ur_roman": "Jawab"},
+    "correct": {"en": "Correct", "ur": "صحیح", "ur_roman": "Sahih"},
+    "wrong": {"en": "Wrong", "ur": "غلط", "ur_roman": "Ghalat"},
+    "excellent": {"en": "Excellent", "ur": "بہترین", "ur_roman": "Behtareen"},
+    "good_try": {"en": "Good try", "ur": "اچھی کوشش", "ur_roman": "Achi Koshish"},
+    "try_again": {"en": "Try again", "ur": "دوبارہ کوشش کریں", "ur_roman": "Dobara Koshish Karen"},
+    "solution": {"en": "Solution", "ur": "حل", "ur_roman": "Hal"},
+    "step": {"en": "Step", "ur": "قدم", "ur_roman": "Qadam"},
+})
+
+# One case-insensitive, whole-word pass over the English phrases,
+# longest first so multi-word phrases win over their parts
+_TRANSLATIONS_BY_PHRASE = {entry["en"].lower(): entry for entry in TRANSLATIONS.values()}
+TRANSLATION_RE = re.compile(
+    r"\b(" + "|".join(
+        map(re.escape, sorted(_TRANSLATIONS_BY_PHRASE, key=len, reverse=True))
+    ) + r")\b",
+    re.IGNORECASE,
+)
+
+CULTURAL_CONTEXTS = MappingProxyType({
+    "en": {
+        "culturalReferences": "Western context",
+        "examples": "Western scenarios",
+        "timeFormat": "12-hour",
+        "dateFormat": "MM/DD/YYYY",
+    },
+    "ur": {
+        "culturalReferences": "Pakistani/Islamic context",
+        "examples": "Pakistani scenarios",
+        "timeFormat": "12-hour",
+        "dateFormat": "DD/MM/YYYY",
+    },
+    "ur_roman": {
+        "culturalReferences": "Pakistani context (Roman script)",
+        "examples": "Pakistani scenarios",
+        "timeFormat": "12-hour",
+        "dateFormat": "DD/MM/YYYY",
+    },
+})
+
+# Display settings merged into content by format_for_language
+LANGUAGE_FORMATS = MappingProxyType({
+    # Urdu: right-to-left
+    "ur": {"direction": "rtl", "font": "urdu", "encoding": "utf-8"},
+    # Roman Urdu: left-to-right
+    "ur_roman": {"direction": "ltr", "font": "roman", "encoding": "utf-8"},
+    "en": {"direction": "ltr", "font": "english", "encoding": "utf-8"},
+})
+
+CULTURE_EXAMPLES = MappingProxyType({
+    "en": {
+        "algebra": "If John has 5 apples...",
+        "geometry": "A rectangular field...",
+    },
+    "ur": {
+        "algebra": "اگر علی کے پاس 5 سیب ہیں...",
+        "geometry": "ایک مربع باغ...",
+    },
+    "ur_roman": {
+        "algebra": "Agar Ali ke paas 5 seb hain...",
+        "geometry": "Ek murabba baagh...",
+    },
+})
+
+# Word swaps applied by adapt_vocabulary; other difficulties keep the text as is
+VOCABULARY_MAPS = MappingProxyType({
+    # Use simpler words
+    "beginner": {
+        "calculate": "find",
+        "determine": "figure out",
+        "demonstrate": "show",
+        "analyze": "look at",
+    },
+    # Use technical terms
+    "advanced": {
+        "find": "calculate",
+        "figure out": "determine",
+        "show": "demonstrate",
+        "look at": "analyze",
+    },
+})
+
 
 class LanguageAgent:
     """Manages multilingual content delivery."""
@@ -15,23 +119,7 @@ class LanguageAgent:
     def __init__(self):
         self.supported_languages = ["en", "ur", "ur_roman"]
         
-        self.translations = {
-            "hello": {"en": "Hello", "ur": "السلام علیکم", "ur_roman": "Assalamu Alaikum"},
-            "what": {"en": "What", "ur": "کیا", "ur_roman": "Kya"},
-            "how": {"en": "How", "ur": "کیسے", "ur_roman": "Kaise"},
-            "why": {"en": "Why", "ur": "کیوں", "ur_roman": "Kyun"},
-            "when": {"en": "When", "ur": "کب", "ur_roman": "Kab"},
-            "where": {"en": "Where", "ur": "کہاں", "ur_roman": "Kahan"},
-            "question": {"en": "Question", "ur": "سوال", "ur_roman": "Sawal"},
-            "answer": {"en": "Answer", "ur": "جواب", "ur_roman": "Jawab"},
-            "correct": {"en": "Correct", "ur": "صحیح", "ur_roman": "Sahih"},
-            "wrong": {"en": "Wrong", "ur": "غلط", "ur_roman": "Ghalat"},
-            "excellent": {"en": "Excellent", "ur": "بہترین", "ur_roman": "Behtareen"},
-            "good_try": {"en": "Good try", "ur": "اچھی کوشش", "ur_roman": "Achi Koshish"},
-            "try_again": {"en": "Try again", "ur": "دوبارہ کوشش کریں", "ur_roman": "Dobara Koshish Karen"},
-            "solution": {"en": "Solution", "ur": "حل", "ur_roman": "Hal"},
-            "step": {"en": "Step", "ur": "قدم", "ur_roman": "Qadam"},
-        }
+        self.translations = TRANSLATIONS
 
     def translate_content(
         self,
@@ -44,18 +132,11 @@ class LanguageAgent:
             return content
         
         # Simple word-by-word translation for demonstration
-        translated = content
-        
-        for english, translations in self.translations.items():
-            if english in content.lower():
-                if targetLanguage in translations:
-                    translated = translated.replace(
-                        english,
-                        translations[targetLanguage],
-                        1
-                    )
+        def replace(match):
+            translations = _TRANSLATIONS_BY_PHRASE[match.group(1).lower()]
+            return translations.get(targetLanguage, match.group(0))
         
-        return translated
+        return TRANSLATION_RE.sub(replace, content)
 
     def format_for_language(
         self,
@@ -63,30 +144,9 @@ class LanguageAgent:
         language: str,
     ) -> Dict[str, Any]:
         """Format content for specific language."""
-        if language == "ur":
-            # Urdu: right-to-left
-            return {
-                **content,
-                "direction": "rtl",
-                "font": "urdu",
-                "encoding": "utf-8",
-            }
-        elif language == "ur_roman":
-            # Roman Urdu: left-to-right
-            return {
-                **content,
-                "direction": "ltr",
-                "font": "roman",
-                "encoding": "utf-8",
-            }
-        else:
-            # English
-            return {
-                **content,
-                "direction": "ltr",
-                "font": "english",
-                "encoding": "utf-8",
-            }
+        formatted = dict(content)
+        formatted.update(LANGUAGE_FORMATS.get(language, LANGUAGE_FORMATS["en"]))
+        return formatted
 
     def generate_multilingual_response(
         self,
@@ -118,16 +178,11 @@ class LanguageAgent:
     ) -> str:
         """Detect user's language preference from input."""
         # Urdu script detection
-        urdu_chars = "آ ب پ ت ٹ ث ج چ ح خ د ڈ ذ ر ڑ ز ژ س ش ص ض ط ظ ع غ ف ق ک گ ل م ن ں و ہ ء ی ے"
-        if any(char in userInput for char in urdu_chars):
+        if URDU_SCRIPT_RE.search(userInput):
             return "ur"
         
         # Roman Urdu detection
-        roman_urdu_patterns = [
-            "kya", "hai", "acha", "bilkul", "theek", "phir", 
-            "seekh", "soch", "likh", "sunn", "pooch"
-        ]
-        if any(pattern in userInput.lower() for pattern in roman_urdu_patterns):
+        if ROMAN_URDU_RE.search(userInput):
             return "ur_roman"
         
         return "en"
@@ -139,24 +194,9 @@ class LanguageAgent:
         language: str,
     ) -> str:
         """Adapt vocabulary level for difficulty."""
-        if difficulty == "beginner":
-            # Use simpler words
-            vocabulary_map = {
-                "calculate": "find",
-                "determine": "figure out",
-                "demonstrate": "show",
-                "analyze": "look at",
-            }
-        elif difficulty == "advanced":
-            # Use technical terms
-            vocabulary_map = {
-                "find": "calculate",
-                "figure out": "determine",
-                "show": "demonstrate",
-                "look at": "analyze",
-            }
-        else:
-            vocabulary_map = {}
+        vocabulary_map = VOCABULARY_MAPS.get(difficulty)
+        if vocabulary_map is None:
+            return content
         
         adapted = content
         for simple, technical in vocabulary_map.items():
@@ -166,28 +206,8 @@ class LanguageAgent:
 
     def get_cultural_context(self, language: str) -> Dict[str, Any]:
         """Get cultural context for language."""
-        contexts = {
-            "en": {
-                "culturalReferences": "Western context",
-                "examples": "Western scenarios",
-                "timeFormat": "12-hour",
-                "dateFormat": "MM/DD/YYYY",
-            },
-            "ur": {
-                "culturalReferences": "Pakistani/Islamic context",
-                "examples": "Pakistani scenarios",
-                "timeFormat": "12-hour",
-                "dateFormat": "DD/MM/YYYY",
-            },
-            "ur_roman": {
-                "culturalReferences": "Pakistani context (Roman script)",
-                "examples": "Pakistani scenarios",
-                "timeFormat": "12-hour",
-                "dateFormat": "DD/MM/YYYY",
-            },
-        }
-        
-        return contexts.get(language, contexts["en"])
+        # Copy so callers can't modify the shared table
+        return dict(CULTURAL_CONTEXTS.get(language, CULTURAL_CONTEXTS["en"]))
 
     def generate_culturally_relevant_example(
         self,
@@ -195,20 +215,5 @@ class LanguageAgent:
         language: str,
     ) -> str:
         """Generate culturally relevant example for topic."""
-        examples = {
-            "en": {
-                "algebra": "If John has 5 apples...",
-                "geometry": "A rectangular field...",
-            },
-            "ur": {
-                "algebra": "اگر علی کے پاس 5 سیب ہیں...",
-                "geometry": "ایک مربع باغ...",
-            },
-            "ur_roman": {
-                "algebra": "Agar Ali ke paas 5 seb hain...",
-                "geometry": "Ek murabba baagh...",
-            },
-        }
-        
-        lang_examples = examples.get(language, examples["en"])
+        lang_examples = CULTURE_EXAMPLES.get(language, CULTURE_EXAMPLES["en"])
         return lang_examples.get(topic, f"Example for {topic}")
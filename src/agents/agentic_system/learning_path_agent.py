@@ -5,15 +5,119 @@ Learning Path Agent
 Adapts learning difficulty dynamically and generates personalized learning paths.
 """
 
-from typing import Dict, List, Any, Optional
+from bisect import bisect_right
+from functools import lru_cache
+from types import MappingProxyType
+from typing import ClassVar, Dict, List, Any, Optional, Tuple
+
+# Difficulty levels in teaching order, and each level's position in it
+DIFFICULTY_LEVELS = ("beginner", "intermediate", "advanced")
+LEVEL_INDEX = MappingProxyType({level: i for i, level in enumerate(DIFFICULTY_LEVELS)})
+# Topic mastery at which a path starts at the next level (one per level above beginner)
+MASTERY_THRESHOLDS = (40, 70)
+# Level changes made by adapt_difficulty; levels not listed stay as they are
+LEVEL_UP = MappingProxyType({"beginner": "intermediate", "intermediate": "advanced"})
+LEVEL_DOWN = MappingProxyType({"advanced": "intermediate", "intermediate": "beginner"})
+# Medium performance only moves beginners up
+LEVEL_NUDGE_UP = MappingProxyType({"beginner": "intermediate"})
+
+# Static lookup tables, shared read-only by every LearningPathAgent.
+# Objective, activity and resource names are templates filled in with the
+# topic (and level); the filled-in text is cached per (topic, level).
+STAGE_BASE_MINUTES = MappingProxyType({
+    "beginner": 30,
+    "intermediate": 45,
+    "advanced": 60,
+})
+
+SPEED_MULTIPLIERS = MappingProxyType({
+    "slow": 1.5,
+    "normal": 1.0,
+    "fast": 0.7,
+})
+
+# Covering every level, and one level on average, at normal speed
+_TOTAL_BASE_MINUTES = sum(STAGE_BASE_MINUTES.values())
+_MEAN_BASE_MINUTES = _TOTAL_BASE_MINUTES / len(STAGE_BASE_MINUTES)
+
+STAGE_OBJECTIVES = MappingProxyType({
+    "beginner": (
+        "Understand basic concepts of {topic}",
+        "Learn fundamental terminology related to {topic}",
+        "Recognize common {topic} patterns",
+    ),
+    "intermediate": (
+        "Apply {topic} to solve problems",
+        "Understand relationships between {topic} concepts",
+        "Solve intermediate difficulty {topic} problems",
+    ),
+    "advanced": (
+        "Solve complex {topic} problems",
+        "Extend {topic} concepts to new domains",
+        "Create novel solutions using {topic}",
+    ),
+})
+
+# (activity type, name template)
+STAGE_ACTIVITIES = MappingProxyType({
+    "beginner": (
+        ("video", "Introduction to {topic}"),
+        ("reading", "Basic concepts of {topic}"),
+        ("practice", "Simple {topic} problems"),
+    ),
+    "intermediate": (
+        ("examples", "Worked examples of {topic}"),
+        ("practice", "Medium difficulty {topic} problems"),
+        ("quiz", "{topic} comprehension check"),
+    ),
+    "advanced": (
+        ("challenge", "Complex {topic} problems"),
+        ("project", "Real-world {topic} application"),
+        ("quiz", "Advanced {topic} assessment"),
+    ),
+})
+
+STAGE_ASSESSMENTS = MappingProxyType({
+    "beginner": MappingProxyType({"type": "quiz", "questions": 5, "passingScore": 70, "timeLimit": 15}),
+    "intermediate": MappingProxyType({"type": "quiz", "questions": 8, "passingScore": 70, "timeLimit": 20}),
+    "advanced": MappingProxyType({"type": "quiz", "questions": 10, "passingScore": 70, "timeLimit": 30}),
+})
+
+# (resource type, title template)
+RESOURCES = (
+    ("textbook", "{topic} - Chapter {level_upper}"),
+    ("video", "Learn {topic} in {level} level"),
+    ("worksheet", "{topic} - {level} practice sheet"),
+)
+
+# Distinct (topic, level) pairs whose filled-in texts are kept
+STAGE_TEXT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=STAGE_TEXT_CACHE_SIZE)
+def _objective_texts(topic: str, level: str) -> tuple:
+    fields = {"topic": topic}
+    return tuple(t.format_map(fields) for t in STAGE_OBJECTIVES.get(level, ()))
+
+
+@lru_cache(maxsize=STAGE_TEXT_CACHE_SIZE)
+def _activity_texts(topic: str, level: str) -> tuple:
+    fields = {"topic": topic}
+    return tuple((kind, t.format_map(fields)) for kind, t in STAGE_ACTIVITIES.get(level, ()))
+
+
+@lru_cache(maxsize=STAGE_TEXT_CACHE_SIZE)
+def _resource_texts(topic: str, level: str) -> tuple:
+    fields = {"topic": topic, "level": level, "level_upper": level.upper()}
+    return tuple((kind, t.format_map(fields)) for kind, t in RESOURCES)
 
 
 class LearningPathAgent:
     """Generates and adapts personalized learning paths."""
 
-    def __init__(self):
-        self.difficulty_levels = ["beginner", "intermediate", "advanced"]
-        self.learning_pace = ["slow", "normal", "fast"]
+    # Shared by every instance; nothing mutates them
+    difficulty_levels: ClassVar[Tuple[str, ...]] = DIFFICULTY_LEVELS
+    learning_pace: ClassVar[Tuple[str, ...]] = tuple(SPEED_MULTIPLIERS)
 
     def generate_learning_path(
         self,
@@ -34,14 +138,7 @@ class LearningPathAgent:
         speed = studentProfile.get("learningSpeed", "normal")
         
         # Determine starting point
-        if mastery == 0:
-            starting_level = "beginner"
-        elif mastery < 40:
-            starting_level = "beginner"
-        elif mastery < 70:
-            starting_level = "intermediate"
-        else:
-            starting_level = "advanced"
+        starting_level = DIFFICULTY_LEVELS[bisect_right(MASTERY_THRESHOLDS, mastery)]
         
         # Build path
         path = {
@@ -71,97 +168,48 @@ class LearningPathAgent:
         speed: str,
     ) -> List[Dict[str, Any]]:
         """Build stages for learning path."""
-        stages = []
+        # Bound once, not looked up on self for every stage
+        get_duration = self._get_stage_duration
+        get_objectives = self._get_stage_objectives
+        get_activities = self._get_stage_activities
+        get_assessment = self._get_stage_assessment
+        get_prerequisite = self._get_prerequisite
         
-        level_index = self.difficulty_levels.index(startingLevel)
-        
-        for idx in range(level_index, len(self.difficulty_levels)):
-            level = self.difficulty_levels[idx]
-            
-            stage = {
-                "stageNumber": idx - level_index + 1,
+        return [
+            {
+                "stageNumber": number,
                 "level": level,
-                "duration": self._get_stage_duration(level, speed),
-                "objectives": self._get_stage_objectives(topic, level),
-                "activities": self._get_stage_activities(topic, level),
-                "assessment": self._get_stage_assessment(topic, level),
-                "prerequisite": self._get_prerequisite(topic, level),
+                "duration": get_duration(level, speed),
+                "objectives": get_objectives(topic, level),
+                "activities": get_activities(topic, level),
+                "assessment": get_assessment(topic, level),
+                "prerequisite": get_prerequisite(topic, level),
             }
-            stages.append(stage)
-        
-        return stages
+            for number, level in enumerate(DIFFICULTY_LEVELS[LEVEL_INDEX[startingLevel]:], 1)
+        ]
 
     def _get_stage_duration(self, level: str, speed: str) -> int:
         """Get estimated duration in minutes."""
-        base_duration = {
-            "beginner": 30,
-            "intermediate": 45,
-            "advanced": 60,
-        }
-        
-        speed_multiplier = {
-            "slow": 1.5,
-            "normal": 1.0,
-            "fast": 0.7,
-        }
-        
-        base = base_duration.get(level, 45)
-        multiplier = speed_multiplier.get(speed, 1.0)
+        base = STAGE_BASE_MINUTES.get(level, 45)
+        multiplier = SPEED_MULTIPLIERS.get(speed, 1.0)
         
         return int(base * multiplier)
 
     def _get_stage_objectives(self, topic: str, level: str) -> List[str]:
         """Get learning objectives for stage."""
-        objectives_map = {
-            "beginner": [
-                f"Understand basic concepts of {topic}",
-                f"Learn fundamental terminology related to {topic}",
-                f"Recognize common {topic} patterns",
-            ],
-            "intermediate": [
-                f"Apply {topic} to solve problems",
-                f"Understand relationships between {topic} concepts",
-                f"Solve intermediate difficulty {topic} problems",
-            ],
-            "advanced": [
-                f"Solve complex {topic} problems",
-                f"Extend {topic} concepts to new domains",
-                f"Create novel solutions using {topic}",
-            ],
-        }
-        
-        return objectives_map.get(level, [])
+        return list(_objective_texts(topic, level))
 
     def _get_stage_activities(self, topic: str, level: str) -> List[Dict[str, str]]:
         """Get recommended activities for stage."""
-        activities_map = {
-            "beginner": [
-                {"type": "video", "name": f"Introduction to {topic}"},
-                {"type": "reading", "name": f"Basic concepts of {topic}"},
-                {"type": "practice", "name": f"Simple {topic} problems"},
-            ],
-            "intermediate": [
-                {"type": "examples", "name": f"Worked examples of {topic}"},
-                {"type": "practice", "name": f"Medium difficulty {topic} problems"},
-                {"type": "quiz", "name": f"{topic} comprehension check"},
-            ],
-            "advanced": [
-                {"type": "challenge", "name": f"Complex {topic} problems"},
-                {"type": "project", "name": f"Real-world {topic} application"},
-                {"type": "quiz", "name": f"Advanced {topic} assessment"},
-            ],
-        }
-        
-        return activities_map.get(level, [])
+        return [
+            {"type": activity_type, "name": name}
+            for activity_type, name in _activity_texts(topic, level)
+        ]
 
     def _get_stage_assessment(self, topic: str, level: str) -> Dict[str, Any]:
         """Get assessment for stage."""
-        return {
-            "type": "quiz",
-            "questions": 5 if level == "beginner" else (8 if level == "intermediate" else 10),
-            "passingScore": 70,
-            "timeLimit": 15 if level == "beginner" else (20 if level == "intermediate" else 30),
-        }
+        # Copy so callers can't modify the shared table
+        return dict(STAGE_ASSESSMENTS.get(level, STAGE_ASSESSMENTS["advanced"]))
 
     def _get_prerequisite(self, topic: str, level: str) -> Optional[str]:
         """Get prerequisite for stage."""
@@ -173,25 +221,11 @@ class LearningPathAgent:
 
     def _estimate_duration(self, speed: str, startingLevel: str) -> Dict[str, int]:
         """Estimate total duration in minutes."""
-        levels_to_cover = len(self.difficulty_levels) - self.difficulty_levels.index(startingLevel)
-        
-        base_minutes = {
-            "beginner": 30,
-            "intermediate": 45,
-            "advanced": 60,
-        }
-        
-        speed_multiplier = {
-            "slow": 1.5,
-            "normal": 1.0,
-            "fast": 0.7,
-        }
-        
-        total = sum(base_minutes.values()) * speed_multiplier.get(speed, 1.0)
+        multiplier = SPEED_MULTIPLIERS.get(speed, 1.0)
         
         return {
-            "total": int(total),
-            "perLevel": int(sum(base_minutes.values()) / len(base_minutes) * speed_multiplier.get(speed, 1.0)),
+            "total": int(_TOTAL_BASE_MINUTES * multiplier),
+            "perLevel": int(_MEAN_BASE_MINUTES * multiplier),
         }
 
     def _create_checkpoints(self, topic: str, startingLevel: str) -> List[Dict[str, Any]]:
@@ -217,9 +251,8 @@ class LearningPathAgent:
     def _select_resources(self, topic: str, level: str) -> List[Dict[str, str]]:
         """Select learning resources."""
         return [
-            {"type": "textbook", "title": f"{topic} - Chapter {level.upper()}"},
-            {"type": "video", "title": f"Learn {topic} in {level} level"},
-            {"type": "worksheet", "title": f"{topic} - {level} practice sheet"},
+            {"type": resource_type, "title": title}
+            for resource_type, title in _resource_texts(topic, level)
         ]
 
     def adapt_difficulty(
@@ -235,24 +268,20 @@ class LearningPathAgent:
         
         # Strong performance: increase difficulty
         if accuracy > 85 and speed == "fast" and attempts <= 2:
-            if currentDifficulty == "beginner":
-                return "intermediate"
-            elif currentDifficulty == "intermediate":
-                return "advanced"
+            changes = LEVEL_UP
         
         # Weak performance: decrease difficulty
         elif accuracy < 60 or attempts > 4:
-            if currentDifficulty == "advanced":
-                return "intermediate"
-            elif currentDifficulty == "intermediate":
-                return "beginner"
+            changes = LEVEL_DOWN
         
         # Medium performance: stay or slight adjustment
         elif accuracy > 70 and speed != "slow":
-            if currentDifficulty in ["beginner", "intermediate"]:
-                return "intermediate" if currentDifficulty == "beginner" else "intermediate"
+            changes = LEVEL_NUDGE_UP
+        
+        else:
+            return currentDifficulty
         
-        return currentDifficulty
+        return changes.get(currentDifficulty, currentDifficulty)
 
     def get_next_topic_recommendation(
         self,
@@ -265,7 +294,8 @@ class LearningPathAgent:
         all_topics = self._extract_topics_from_curriculum(curriculum)
         
         # Filter out completed topics
-        remaining_topics = [t for t in all_topics if t not in completedTopics]
+        completed = set(completedTopics)
+        remaining_topics = [t for t in all_topics if t not in completed]
         
         if not remaining_topics:
             return None
@@ -283,12 +313,11 @@ class LearningPathAgent:
 
     def _extract_topics_from_curriculum(self, curriculum: Dict[str, Any]) -> List[str]:
         """Extract all topics from curriculum."""
-        topics = []
-        chapters = curriculum.get("chapters", [])
-        for chapter in chapters:
-            for topic in chapter.get("topics", []):
-                topics.append(topic.get("name"))
-        return topics
+        return [
+            topic.get("name")
+            for chapter in curriculum.get("chapters", [])
+            for topic in chapter.get("topics", [])
+        ]
 
     def _prerequisites_met(self, topic: str, completedTopics: List[str]) -> bool:
         """Check if prerequisites for topic are met."""
@@ -6,10 +6,15 @@ Coordinates all agents and orchestrates the learning experience.
 Receives student input and produces final response through agent pipeline.
 """
 
-import json
+import asyncio
+import math
+import statistics
+import time
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 from src.agents.agentic_system.student_profiler import StudentProfiler
 from src.agents.agentic_system.curriculum_agent import CurriculumAgent
@@ -17,6 +22,33 @@ from src.agents.agentic_system.tutor_agent import TutorAgent
 from src.agents.agentic_system.language_agent import LanguageAgent
 from src.agents.agentic_system.safety_agent import SafetyAgent
 from src.agents.agentic_system.learning_path_agent import LearningPathAgent
+from src.services.agent_trace_logger import (
+    append_trace_lines,
+    decode_trace_line,
+    encode_trace_line,
+    rotated_trace_path,
+)
+
+# Most queued traces the background writer appends in one go
+TRACE_WRITE_BATCH = 32
+
+
+async def _timed(durations: Dict[str, float], name: str, coro):
+    """Await coro, recording its wall-clock time in ms under durations[name]."""
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        durations[name] = round((time.perf_counter() - start) * 1000, 3)
+
+
+def _tail_lines(path: Path, limit: int) -> List[bytes]:
+    """Last `limit` lines of a file ([] if it can't be read)."""
+    try:
+        with path.open("rb") as f:
+            return list(deque(f, maxlen=max(limit, 0)))
+    except OSError:
+        return []
 
 
 class AgentOrchestrator:
@@ -25,7 +57,7 @@ class AgentOrchestrator:
     
     Flow:
     StudentInput → StudentProfiler → CurriculumAgent → TutorAgent 
-                → LanguageAgent → SafetyAgent → LearningPathAgent → Response
+                → (LanguageAgent → SafetyAgent  ∥  LearningPathAgent) → Response
     """
 
     def __init__(self, project_root: Path = None):
@@ -46,7 +78,12 @@ class AgentOrchestrator:
         # Initialize logging
         self.logs_dir = self.project_root / "logs"
         self.logs_dir.mkdir(parents=True, exist_ok=True)
-        self.trace_log = self.logs_dir / "agent_trace.json"
+        self.trace_log = self.logs_dir / "agent_trace.jsonl"
+        self.rotated_trace_log = rotated_trace_path(self.trace_log)
+        # Background trace writer, started on first use in each event loop
+        self._trace_loop = None
+        self._trace_queue = None
+        self._trace_writer = None
 
     async def process_student_input(
         self,
@@ -71,53 +108,68 @@ class AgentOrchestrator:
             "studentId": studentId or self.student_profiler.student_id,
             "agents": {},
         }
+        # Per-agent wall-clock times in ms, plus the whole pipeline's
+        durations = {}
+        started = time.perf_counter()
         
         try:
             # Step 1: Student Profiler
-            profiler_output = await self._run_student_profiler(studentInput)
+            profiler_output = await _timed(
+                durations, "studentProfiler",
+                self._run_student_profiler(studentInput),
+            )
             trace["agents"]["studentProfiler"] = profiler_output
             
             # Step 2: Curriculum Agent
-            curriculum_output = await self._run_curriculum_agent(
-                profiler_output,
-                context,
+            curriculum_output = await _timed(
+                durations, "curriculumAgent",
+                self._run_curriculum_agent(
+                    profiler_output,
+                    context,
+                ),
             )
             trace["agents"]["curriculumAgent"] = curriculum_output
             
             # Step 3: Tutor Agent
-            tutor_output = await self._run_tutor_agent(
-                studentInput,
-                profiler_output,
-                curriculum_output,
+            tutor_output = await _timed(
+                durations, "tutorAgent",
+                self._run_tutor_agent(
+                    studentInput,
+                    profiler_output,
+                    curriculum_output,
+                ),
             )
             trace["agents"]["tutorAgent"] = tutor_output
             
-            # Step 4: Language Agent
-            language_output = await self._run_language_agent(
-                tutor_output,
-                profiler_output,
+            # Steps 4-5 (Language Agent, then Safety Agent) and step 6
+            # (Learning Path Agent) don't depend on each other, so the two
+            # branches run concurrently
+            (language_output, safety_output), path_output = await asyncio.gather(
+                self._run_language_and_safety(
+                    tutor_output,
+                    profiler_output,
+                    curriculum_output,
+                    durations,
+                ),
+                _timed(
+                    durations, "learningPathAgent",
+                    self._run_learning_path_agent(
+                        profiler_output,
+                        curriculum_output,
+                    ),
+                ),
             )
             trace["agents"]["languageAgent"] = language_output
-            
-            # Step 5: Safety Agent
-            safety_output = await self._run_safety_agent(
-                language_output,
-                profiler_output,
-                curriculum_output,
-            )
             trace["agents"]["safetyAgent"] = safety_output
-            
-            # Step 6: Learning Path Agent
-            path_output = await self._run_learning_path_agent(
-                profiler_output,
-                curriculum_output,
-            )
             trace["agents"]["learningPathAgent"] = path_output
             
             # Step 7: Compile final response
             final_response = await self._compile_final_response(
-                trace,
                 profiler_output,
+                tutor_output,
+                language_output,
+                safety_output,
+                path_output,
             )
             
             trace["finalResponse"] = final_response
@@ -132,6 +184,9 @@ class AgentOrchestrator:
                 "error": str(e),
             }
         
+        trace["durationsMs"] = durations
+        trace["responseTimeMs"] = round((time.perf_counter() - started) * 1000, 3)
+        
         # Log the trace
         self._log_trace(trace)
         
@@ -222,6 +277,31 @@ class AgentOrchestrator:
             "topicCovered": topic,
         }
 
+    async def _run_language_and_safety(
+        self,
+        tutorOutput: Dict[str, Any],
+        profilerOutput: Dict[str, Any],
+        curriculumOutput: Dict[str, Any],
+        durations: Dict[str, float],
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run LanguageAgent, then SafetyAgent on its output."""
+        language_output = await _timed(
+            durations, "languageAgent",
+            self._run_language_agent(
+                tutorOutput,
+                profilerOutput,
+            ),
+        )
+        safety_output = await _timed(
+            durations, "safetyAgent",
+            self._run_safety_agent(
+                language_output,
+                profilerOutput,
+                curriculumOutput,
+            ),
+        )
+        return language_output, safety_output
+
     async def _run_language_agent(
         self,
         tutorOutput: Dict[str, Any],
@@ -314,35 +394,32 @@ class AgentOrchestrator:
 
     async def _compile_final_response(
         self,
-        trace: Dict[str, Any],
         profilerOutput: Dict[str, Any],
+        tutorOutput: Dict[str, Any],
+        languageOutput: Dict[str, Any],
+        safetyOutput: Dict[str, Any],
+        pathOutput: Dict[str, Any],
     ) -> Dict[str, Any]:
         """Compile all agent outputs into final response."""
-        tutor = trace["agents"].get("tutorAgent", {})
-        safety = trace["agents"].get("safetyAgent", {})
-        language = trace["agents"].get("languageAgent", {})
-        path = trace["agents"].get("learningPathAgent", {})
-        
         # Build final response
         final = {
             "status": "success",
-            "message": safety.get("filteredResponse", ""),
+            "message": safetyOutput.get("filteredResponse", ""),
             "topic": profilerOutput.get("topic"),
-            "explanation": tutor.get("explanation", {}),
-            "practiceQuestion": tutor.get("practiceQuestion", {}),
-            "learningPath": path.get("learningPath", {}),
-            "language": language.get("language"),
-            "difficulty": tutor.get("difficulty"),
-            "nextSteps": self._generate_next_steps(trace),
+            "explanation": tutorOutput.get("explanation", {}),
+            "practiceQuestion": tutorOutput.get("practiceQuestion", {}),
+            "learningPath": pathOutput.get("learningPath", {}),
+            "language": languageOutput.get("language"),
+            "difficulty": tutorOutput.get("difficulty"),
+            "nextSteps": self._generate_next_steps(pathOutput),
             "studentProfile": profilerOutput.get("studentProfile"),
         }
         
         return final
 
-    def _generate_next_steps(self, trace: Dict[str, Any]) -> List[str]:
+    def _generate_next_steps(self, pathOutput: Dict[str, Any]) -> List[str]:
         """Generate next steps for student."""
-        learning_path = trace["agents"].get("learningPathAgent", {})
-        stages = learning_path.get("stages", [])
+        stages = pathOutput.get("stages", [])
         
         if not stages:
             return ["Review the explanation", "Try the practice question"]
@@ -358,35 +435,64 @@ class AgentOrchestrator:
     def _log_trace(self, trace: Dict[str, Any]) -> None:
         """Log trace of agent execution."""
         try:
-            # Load existing traces
-            traces = []
-            if self.trace_log.exists():
-                try:
-                    traces = json.loads(self.trace_log.read_text())
-                except:
-                    traces = []
-            
-            # Add new trace
-            traces.append(trace)
-            
-            # Keep last 1000 traces
-            traces = traces[-1000:]
-            
-            # Save traces
-            self.trace_log.write_text(json.dumps(traces, indent=2))
+            line = encode_trace_line(trace)
+        except Exception as e:
+            print(f"Error logging trace: {e}")
+            return
+        
+        # Inside an event loop the disk write is left to the background
+        # writer, keeping it off the request path
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_trace_lines([line])
+            return
+        
+        if self._trace_loop is not loop:
+            self._trace_loop = loop
+            self._trace_queue = asyncio.Queue()
+            self._trace_writer = loop.create_task(self._trace_writer_loop(self._trace_queue))
+        self._trace_queue.put_nowait(line)
+
+    async def _trace_writer_loop(self, queue: asyncio.Queue) -> None:
+        """Append queued trace lines in batches, in a worker thread."""
+        try:
+            while True:
+                lines = [await queue.get()]
+                while len(lines) < TRACE_WRITE_BATCH and not queue.empty():
+                    lines.append(queue.get_nowait())
+                await asyncio.to_thread(self._write_trace_lines, lines)
+        except asyncio.CancelledError:
+            # Event loop shutting down: write out whatever is still queued
+            lines = []
+            while not queue.empty():
+                lines.append(queue.get_nowait())
+            if lines:
+                self._write_trace_lines(lines)
+            raise
+
+    def _write_trace_lines(self, lines: List[bytes]) -> None:
+        """Append serialized traces to the trace log."""
+        try:
+            append_trace_lines(self.trace_log, lines)
         except Exception as e:
             print(f"Error logging trace: {e}")
 
     def get_agent_traces(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Retrieve recent agent traces."""
-        if not self.trace_log.exists():
-            return []
-        
-        try:
-            traces = json.loads(self.trace_log.read_text())
-            return traces[-limit:]
-        except:
-            return []
+        # Only the last `limit` lines are kept while reading; the rotated
+        # file is read only when the current one holds fewer than that
+        lines = _tail_lines(self.trace_log, limit)
+        if len(lines) < limit:
+            lines[:0] = _tail_lines(self.rotated_trace_log, limit - len(lines))
+        
+        traces = []
+        for line in lines:
+            try:
+                traces.append(decode_trace_line(line))
+            except ValueError:
+                continue
+        return traces
 
     def get_trace_summary(self, studentId: str = None) -> Dict[str, Any]:
         """Get summary of agent traces."""
@@ -395,9 +501,25 @@ class AgentOrchestrator:
         if studentId:
             traces = [t for t in traces if t.get("studentId") == studentId]
         
+        # Older traces were logged without timings
+        times = sorted(t["responseTimeMs"] for t in traces if "responseTimeMs" in t)
+        
         return {
             "totalTraces": len(traces),
             "successCount": sum(1 for t in traces if t.get("status") == "success"),
             "errorCount": sum(1 for t in traces if t.get("status") == "error"),
-            "avgResponseTime": "N/A",  # Would calculate from timestamps
+            # Milliseconds; percentiles are nearest-rank
+            "avgResponseTime": round(statistics.fmean(times), 3) if times else "N/A",
+            "p50ResponseTime": times[math.ceil(0.50 * len(times)) - 1] if times else "N/A",
+            "p95ResponseTime": times[math.ceil(0.95 * len(times)) - 1] if times else "N/A",
         }
+
+
+@lru_cache(maxsize=1)
+def get_orchestrator(project_root: Path = None) -> AgentOrchestrator:
+    """Return the process-wide orchestrator for project_root, creating it once.
+
+    Agents and their caches are built on the first call and then shared;
+    per-request state lives in process_student_input's locals.
+    """
+    return AgentOrchestrator(project_root=project_root)
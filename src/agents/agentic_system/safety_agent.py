@@ -6,32 +6,69 @@ Enforces content safety and syllabus boundaries.
 Prevents harmful content and ensures age-appropriate learning.
 """
 
+import re
+from bisect import bisect_left
+from types import MappingProxyType
 from typing import Dict, List, Any
 
+# Static lookup tables, shared read-only by every SafetyAgent
+SAFETY_LEVELS = MappingProxyType({
+    "unrestricted": 1,
+    "general": 2,
+    "educational": 3,
+    "restricted": 4,
+})
+
+BANNED_KEYWORDS = (
+    "violence", "hate", "discrimination", "abuse",
+    "drug", "alcohol", "smoking", "adult",
+)
+
+HARMFUL_PATTERNS = (
+    "hurt yourself",
+    "harm others",
+    "dangerous method",
+    "illegal",
+    "hate",
+)
+
+AGE_APPROPRIATE_TOPICS = MappingProxyType({
+    "grade_1_3": ("basic_math", "colors", "animals", "numbers"),
+    "grade_4_6": ("multiplication", "division", "simple_geometry", "science_basics"),
+    "grade_7_8": ("algebra", "geometry", "physics_basics", "chemistry_basics"),
+    "grade_9_10": ("advanced_algebra", "trigonometry", "physics", "chemistry"),
+    "grade_11_12": ("calculus", "advanced_physics", "organic_chemistry", "statistics"),
+})
+
+# Highest grade in each range of AGE_APPROPRIATE_TOPICS, in order; later
+# grades fall in the last range
+GRADE_RANGE_BOUNDS = (3, 6, 8, 10)
+GRADE_RANGES = tuple(AGE_APPROPRIATE_TOPICS)
+
+# Banned keywords and harmful patterns, all found in one pass over lowercased
+# content. The lookahead tries every position, so overlapping phrases are all
+# reported (none of them is a prefix of another, which would hide the shorter).
+SAFETY_PHRASE_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(set(BANNED_KEYWORDS + HARMFUL_PATTERNS)))) + "))"
+)
+
+# Banned keywords as written (lowercase), for censoring in a single pass.
+# No two keywords can overlap, so one sub() matches replacing them in turn.
+BANNED_KEYWORD_RE = re.compile("|".join(map(re.escape, BANNED_KEYWORDS)))
+
+
+def _find_safety_phrases(content_lower: str) -> set:
+    """Return the banned keywords and harmful patterns occurring in content_lower."""
+    return set(SAFETY_PHRASE_RE.findall(content_lower))
+
 
 class SafetyAgent:
     """Ensures content safety and policy compliance."""
 
     def __init__(self):
-        self.safety_levels = {
-            "unrestricted": 1,
-            "general": 2,
-            "educational": 3,
-            "restricted": 4,
-        }
-        
-        self.banned_keywords = [
-            "violence", "hate", "discrimination", "abuse",
-            "drug", "alcohol", "smoking", "adult",
-        ]
-        
-        self.age_appropriate_topics = {
-            "grade_1_3": ["basic_math", "colors", "animals", "numbers"],
-            "grade_4_6": ["multiplication", "division", "simple_geometry", "science_basics"],
-            "grade_7_8": ["algebra", "geometry", "physics_basics", "chemistry_basics"],
-            "grade_9_10": ["advanced_algebra", "trigonometry", "physics", "chemistry"],
-            "grade_11_12": ["calculus", "advanced_physics", "organic_chemistry", "statistics"],
-        }
+        self.safety_levels = SAFETY_LEVELS
+        self.banned_keywords = BANNED_KEYWORDS
+        self.age_appropriate_topics = AGE_APPROPRIATE_TOPICS
 
     def check_content_safety(
         self,
@@ -50,12 +87,14 @@ class SafetyAgent:
                 "recommendations": [],
             }
         """
-        issues = []
+        found = _find_safety_phrases(content.lower())
         
         # Check for banned keywords
-        for keyword in self.banned_keywords:
-            if keyword.lower() in content.lower():
-                issues.append(f"Contains banned keyword: {keyword}")
+        issues = [
+            f"Contains banned keyword: {keyword}"
+            for keyword in BANNED_KEYWORDS
+            if keyword in found
+        ]
         
         # Check age appropriateness
         age_check = self._check_age_appropriateness(grade, topic)
@@ -63,7 +102,7 @@ class SafetyAgent:
             issues.append(age_check["reason"])
         
         # Check for violent or harmful content
-        if self._contains_harmful_content(content):
+        if not found.isdisjoint(HARMFUL_PATTERNS):
             issues.append("Content contains potentially harmful material")
         
         # Determine safety level
@@ -81,23 +120,12 @@ class SafetyAgent:
 
     def _check_age_appropriateness(self, grade: int, topic: str) -> Dict[str, Any]:
         """Check if topic is appropriate for grade."""
-        if grade <= 3:
-            grade_range = "grade_1_3"
-        elif grade <= 6:
-            grade_range = "grade_4_6"
-        elif grade <= 8:
-            grade_range = "grade_7_8"
-        elif grade <= 10:
-            grade_range = "grade_9_10"
-        else:
-            grade_range = "grade_11_12"
-        
-        allowed_topics = self.age_appropriate_topics.get(grade_range, [])
+        grade_range = GRADE_RANGES[bisect_left(GRADE_RANGE_BOUNDS, grade)]
+        allowed_topics = AGE_APPROPRIATE_TOPICS[grade_range]
         
         # Simple check: see if topic matches allowed topics
-        is_appropriate = any(
-            allowed in topic.lower() for allowed in allowed_topics
-        )
+        topic_lower = topic.lower()
+        is_appropriate = any(allowed in topic_lower for allowed in allowed_topics)
         
         return {
             "isAppropriate": is_appropriate,
@@ -105,18 +133,6 @@ class SafetyAgent:
             "gradeRange": grade_range,
         }
 
-    def _contains_harmful_content(self, content: str) -> bool:
-        """Check for harmful content patterns."""
-        harmful_patterns = [
-            "hurt yourself",
-            "harm others",
-            "dangerous method",
-            "illegal",
-            "hate",
-        ]
-        
-        return any(pattern in content.lower() for pattern in harmful_patterns)
-
     def _determine_safety_level(self, issues: List[str], grade: int) -> str:
         """Determine safety level based on issues."""
         if len(issues) == 0:
@@ -180,13 +196,15 @@ class SafetyAgent:
     ) -> Dict[str, Any]:
         """Filter response to ensure safety."""
         filtered_response = response
-        censored_count = 0
-        
-        for keyword in self.banned_keywords:
-            if keyword in filtered_response.lower():
-                # Replace with asterisks
-                filtered_response = filtered_response.replace(keyword, "*" * len(keyword))
-                censored_count += 1
+        found = _find_safety_phrases(response.lower())
+        censored_count = sum(1 for keyword in BANNED_KEYWORDS if keyword in found)
+        
+        if censored_count:
+            # Replace with asterisks
+            filtered_response = BANNED_KEYWORD_RE.sub(
+                lambda match: "*" * len(match.group()),
+                response,
+            )
         
         return {
             "originalLength": len(response),
@@ -6,12 +6,64 @@ Analyzes student input and builds/updates student profile.
 Tracks learning speed, confidence, mastery levels, and mistakes.
 """
 
+import copy
 import json
+import re
 from pathlib import Path
 from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 import uuid
 
+# Letters of the Urdu alphabet
+URDU_LETTERS = frozenset("آبپتٹثجچحخدڈذرڑزژسشصضطظعغفقکگلمنںوہءیے")
+
+# Common Roman Urdu words, matched anywhere in the input
+ROMAN_URDU_RE = re.compile("kya|hai|acha|bilkul|theek")
+
+# Confidence adjustment for each phrase found in the input
+CONFIDENCE_INDICATORS = MappingProxyType({
+    "i'm sure": 10,
+    "i think": -5,
+    "i don't know": -15,
+    "definitely": 15,
+    "maybe": -10,
+    "confused": -20,
+})
+
+# Phrases suggesting the student is checking a (possibly wrong) answer
+MISTAKE_PATTERNS = (
+    "i got",
+    "my answer was",
+    "i think it's",
+    "is this right",
+    "why is",
+)
+
+# Keywords that mark a topic; when several topics match, the first listed wins
+TOPIC_KEYWORDS = MappingProxyType({
+    "algebra": ("equation", "variable", "linear", "quadratic"),
+    "geometry": ("triangle", "circle", "angle", "area", "perimeter"),
+    "physics": ("force", "motion", "energy", "newton", "velocity"),
+    "chemistry": ("element", "compound", "reaction", "atom", "molecule"),
+    "biology": ("cell", "organism", "evolution", "genetics", "photosynthesis"),
+    "english": ("grammar", "vocabulary", "reading", "writing", "comprehension"),
+    "urdu": ("grammar", "vocabulary", "شاعری", "grammar"),
+})
+_TOPIC_RANK = {topic: rank for rank, topic in enumerate(TOPIC_KEYWORDS)}
+# Built last-topic-first, so a keyword listed under several topics maps to the first
+_TOPIC_BY_KEYWORD = {
+    keyword: topic
+    for topic, keywords in reversed(TOPIC_KEYWORDS.items())
+    for keyword in keywords
+}
+
+# Every topic keyword in one pass; the lookahead also reports overlapping
+# keywords (none is a prefix of another, which would hide the shorter)
+TOPIC_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_TOPIC_BY_KEYWORD))) + "))"
+)
+
 
 class StudentProfiler:
     """Profiles student based on input, performance, and interaction patterns."""
@@ -20,27 +72,52 @@ class StudentProfiler:
         self.profile_dir = profile_dir or Path(__file__).parent.parent.parent.parent / "data"
         self.profile_dir.mkdir(parents=True, exist_ok=True)
         self.profile_path = self.profile_dir / "studentProfile.json"
+        # Parsed profile file, and the (mtime, size) it was parsed at
+        self._profile = None
+        self._profile_stamp = None
         self.student_id = self._get_or_create_student_id()
 
     def _get_or_create_student_id(self) -> str:
         """Get existing student ID or create new one."""
-        if self.profile_path.exists():
-            try:
-                data = json.loads(self.profile_path.read_text())
-                return data.get("student_id")
-            except:
-                pass
+        profile = self._read_profile_file()
+        if profile is not None:
+            return profile.get("student_id")
         return str(uuid.uuid4())
 
+    def _profile_file_stamp(self):
+        """Return the profile file's (mtime, size), or None if it is missing."""
+        try:
+            st = self.profile_path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read_profile_file(self) -> Optional[Dict[str, Any]]:
+        """Return the saved profile, re-parsing the file only after it changes."""
+        stamp = self._profile_file_stamp()
+        if stamp is None:
+            return None
+        if stamp != self._profile_stamp:
+            try:
+                self._profile = json.loads(self.profile_path.read_text())
+            except (OSError, ValueError):
+                self._profile = None
+            self._profile_stamp = stamp
+        return self._profile
+
     def load_profile(self) -> Dict[str, Any]:
         """Load student profile from file."""
-        if self.profile_path.exists():
-            try:
-                return json.loads(self.profile_path.read_text())
-            except:
-                pass
+        # A copy, so callers can't change the cached profile behind the file's back
+        return copy.deepcopy(self._current_profile())
+
+    def _current_profile(self) -> Dict[str, Any]:
+        """Return the saved profile, or a new default one; read-only for callers."""
+        profile = self._read_profile_file()
+        if profile is not None:
+            return profile
         
         # Default profile
+        now = datetime.now().isoformat()
         return {
             "student_id": self.student_id,
             "grade": None,
@@ -50,8 +127,8 @@ class StudentProfiler:
             "topicMastery": {},   # topic_id -> mastery_level (0-100)
             "mistakes": [],       # Recent mistakes
             "confidence": 50,     # 0-100
-            "created_at": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat(),
+            "created_at": now,
+            "last_updated": now,
             "interactions": 0,
             "strengths": [],
             "weaknesses": [],
@@ -73,99 +150,67 @@ class StudentProfiler:
                 "nextDifficulty": recommended difficulty,
             }
         """
-        profile = self.load_profile()
+        profile = self._current_profile()
+        # Lowercased once here for every helper below
+        input_lower = user_input.lower()
         
         analysis = {
             "grade": profile.get("grade"),
             "board": profile.get("board"),
-            "language": self._detect_language(user_input),
+            "language": self._detect_language(user_input, input_lower),
             "learningSpeed": profile.get("learningSpeed"),
-            "confidence": self._assess_confidence(user_input, profile),
-            "topicOfInterest": self._extract_topic(user_input),
-            "mistakeDetected": self._detect_mistake(user_input),
+            "confidence": self._assess_confidence(input_lower, profile),
+            "topicOfInterest": self._extract_topic(input_lower),
+            "mistakeDetected": self._detect_mistake(input_lower),
             "nextDifficulty": self._assess_next_difficulty(profile),
             "engagementLevel": self._assess_engagement(profile),
         }
         
         return analysis
 
-    def _detect_language(self, text: str) -> str:
-        """Detect language: en, ur, ur_roman."""
+    def _detect_language(self, text: str, text_lower: str) -> str:
+        """Detect language: en, ur, ur_roman. text_lower is text.lower()."""
         if not text:
             return "en"
         
         # Simple detection
-        urdu_chars = "آ ب پ ت ٹ ث ج چ ح خ د ڈ ذ ر ڑ ز ژ س ش ص ض ط ظ ع غ ف ق ک گ ل م ن ں و ہ ء ی ے"
-        if any(char in text for char in urdu_chars):
+        if not URDU_LETTERS.isdisjoint(text):
             return "ur"
         
         # Roman Urdu detection (common patterns)
-        roman_urdu_patterns = ["kya", "hai", "acha", "bilkul", "theek"]
-        if any(pattern in text.lower() for pattern in roman_urdu_patterns):
+        if ROMAN_URDU_RE.search(text_lower):
             return "ur_roman"
         
         return "en"
 
-    def _assess_confidence(self, text: str, profile: Dict) -> int:
-        """Assess student's confidence level."""
+    def _assess_confidence(self, text_lower: str, profile: Dict) -> int:
+        """Assess student's confidence level from already-lowercased text."""
         base = profile.get("confidence", 50)
         
-        confidence_indicators = {
-            "i'm sure": 10,
-            "i think": -5,
-            "i don't know": -15,
-            "definitely": 15,
-            "maybe": -10,
-            "confused": -20,
-        }
-        
         adjustment = 0
-        text_lower = text.lower()
-        for indicator, value in confidence_indicators.items():
+        for indicator, value in CONFIDENCE_INDICATORS.items():
             if indicator in text_lower:
                 adjustment += value
         
         return max(0, min(100, base + adjustment))
 
-    def _extract_topic(self, text: str) -> Optional[str]:
-        """Extract topic from student input."""
+    def _extract_topic(self, text_lower: str) -> Optional[str]:
+        """Extract topic from already-lowercased student input."""
         # Simple keyword matching
-        topics = {
-            "algebra": ["equation", "variable", "linear", "quadratic"],
-            "geometry": ["triangle", "circle", "angle", "area", "perimeter"],
-            "physics": ["force", "motion", "energy", "newton", "velocity"],
-            "chemistry": ["element", "compound", "reaction", "atom", "molecule"],
-            "biology": ["cell", "organism", "evolution", "genetics", "photosynthesis"],
-            "english": ["grammar", "vocabulary", "reading", "writing", "comprehension"],
-            "urdu": ["grammar", "vocabulary", "شاعری", "grammar"],
-        }
-        
-        text_lower = text.lower()
-        for topic, keywords in topics.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return topic
-        
-        return None
+        matched = {_TOPIC_BY_KEYWORD[keyword] for keyword in TOPIC_KEYWORD_RE.findall(text_lower)}
+        return min(matched, key=_TOPIC_RANK.__getitem__) if matched else None
 
-    def _detect_mistake(self, text: str) -> bool:
-        """Detect if student made a conceptual mistake."""
+    def _detect_mistake(self, text_lower: str) -> bool:
+        """Detect if student made a conceptual mistake, from already-lowercased text."""
         # Simple heuristic
-        mistake_patterns = [
-            "i got",
-            "my answer was",
-            "i think it's",
-            "is this right",
-            "why is",
-        ]
-        return any(pattern in text.lower() for pattern in mistake_patterns)
+        return any(pattern in text_lower for pattern in MISTAKE_PATTERNS)
 
     def _assess_next_difficulty(self, profile: Dict) -> str:
         """Recommend difficulty level based on profile."""
-        mastery = profile.get("topicMastery", {})
-        if not mastery:
+        if not profile.get("topicMastery"):
             return "beginner"
         
-        avg_mastery = sum(mastery.values()) / len(mastery) if mastery else 0
+        avg_mastery = self._average_mastery(profile)
         confidence = profile.get("confidence", 50)
         
         if avg_mastery > 80 and confidence > 75:
@@ -175,6 +220,11 @@ class StudentProfiler:
         else:
             return "beginner"
 
+    def _average_mastery(self, profile: Dict) -> float:
+        """Mean mastery over the profile's topics, 0 when there are none."""
+        mastery = profile.get("topicMastery")
+        return sum(mastery.values()) / len(mastery) if mastery else 0
+
     def _assess_engagement(self, profile: Dict) -> str:
         """Assess student engagement level."""
         interactions = profile.get("interactions", 0)
@@ -200,6 +250,7 @@ class StudentProfiler:
     ) -> Dict[str, Any]:
         """Update student profile with new information."""
         profile = self.load_profile()
+        now = datetime.now().isoformat()
         
         if grade:
             profile["grade"] = grade
@@ -217,7 +268,7 @@ class StudentProfiler:
         # Track mistakes
         if mistakeMade:
             profile["mistakes"].append({
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now,
                 "topic": topicId,
             })
             # Keep only last 10 mistakes
@@ -230,16 +281,18 @@ class StudentProfiler:
         profile["interactions"] = profile.get("interactions", 0) + 1
         
         # Update timestamp
-        profile["last_updated"] = datetime.now().isoformat()
+        profile["last_updated"] = now
         
-        # Save profile
-        self.profile_path.write_text(json.dumps(profile, indent=2))
+        # Save profile; profile is a copy, so the cache only takes the changes
+        # once they are on disk
+        self.profile_path.write_text(json.dumps(profile, separators=(",", ":")))
+        self._profile, self._profile_stamp = profile, self._profile_file_stamp()
         
-        return profile
+        return copy.deepcopy(profile)
 
     def get_student_summary(self) -> Dict[str, Any]:
         """Get summary of student profile for other agents."""
-        profile = self.load_profile()
+        profile = self._current_profile()
         
         return {
             "student_id": profile.get("student_id"),
@@ -247,12 +300,8 @@ class StudentProfiler:
             "board": profile.get("board"),
             "language": profile.get("language"),
             "learningSpeed": profile.get("learningSpeed"),
-            "avgMastery": (
-                sum(profile.get("topicMastery", {}).values()) / len(profile.get("topicMastery", {}))
-                if profile.get("topicMastery")
-                else 0
-            ),
-            "recentMistakes": profile.get("mistakes", [])[-3:],
+            "avgMastery": self._average_mastery(profile),
+            "recentMistakes": copy.deepcopy(profile.get("mistakes", [])[-3:]),
             "confidence": profile.get("confidence", 50),
             "engagementLevel": self._assess_engagement(profile),
         }
@@ -6,30 +6,52 @@ Generates explanations and tutoring content based on student needs.
 Adapts explanation difficulty and style to student level.
 """
 
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional
 
+# Static lookup tables, shared read-only by every TutorAgent
+EXPLANATION_TEMPLATES = MappingProxyType({
+    "beginner": {
+        "structure": ["simple_intro", "basic_concept", "one_example", "key_takeaway"],
+        "vocabulary": "simple",
+        "examples": 1,
+    },
+    "intermediate": {
+        "structure": ["intro", "concept", "two_examples", "applications", "summary"],
+        "vocabulary": "technical",
+        "examples": 2,
+    },
+    "advanced": {
+        "structure": ["intro", "deep_concept", "multiple_examples", "proofs", "extensions"],
+        "vocabulary": "advanced",
+        "examples": 3,
+    },
+})
+
+COMMON_MISTAKES = MappingProxyType({
+    "algebra": (
+        "Forgetting to apply operation to both sides of equation",
+        "Sign errors when moving terms across equals sign",
+        "Not distributing coefficients correctly",
+    ),
+    "geometry": (
+        "Confusing perimeter and area",
+        "Not using correct angle relationships",
+        "Missing units in final answer",
+    ),
+    "physics": (
+        "Confusing velocity and acceleration",
+        "Forgetting to include direction in vector answers",
+        "Not considering all forces in force diagrams",
+    ),
+})
+
 
 class TutorAgent:
     """Provides personalized tutoring and explanations."""
 
     def __init__(self):
-        self.explanation_templates = {
-            "beginner": {
-                "structure": ["simple_intro", "basic_concept", "one_example", "key_takeaway"],
-                "vocabulary": "simple",
-                "examples": 1,
-            },
-            "intermediate": {
-                "structure": ["intro", "concept", "two_examples", "applications", "summary"],
-                "vocabulary": "technical",
-                "examples": 2,
-            },
-            "advanced": {
-                "structure": ["intro", "deep_concept", "multiple_examples", "proofs", "extensions"],
-                "vocabulary": "advanced",
-                "examples": 3,
-            },
-        }
+        self.explanation_templates = EXPLANATION_TEMPLATES
 
     def generate_explanation(
         self,
@@ -47,7 +69,7 @@ class TutorAgent:
             difficulty: beginner, intermediate, advanced
             style: structured, conversational, story_based
         """
-        template = self.explanation_templates.get(difficulty, self.explanation_templates["intermediate"])
+        template = EXPLANATION_TEMPLATES.get(difficulty, EXPLANATION_TEMPLATES["intermediate"])
         
         explanation = {
             "topic": topic,
@@ -104,25 +126,8 @@ class TutorAgent:
 
     def _identify_common_mistakes(self, topic: str, difficulty: str) -> List[str]:
         """Identify common mistakes for a topic."""
-        common_mistakes = {
-            "algebra": [
-                "Forgetting to apply operation to both sides of equation",
-                "Sign errors when moving terms across equals sign",
-                "Not distributing coefficients correctly",
-            ],
-            "geometry": [
-                "Confusing perimeter and area",
-                "Not using correct angle relationships",
-                "Missing units in final answer",
-            ],
-            "physics": [
-                "Confusing velocity and acceleration",
-                "Forgetting to include direction in vector answers",
-                "Not considering all forces in force diagrams",
-            ],
-        }
-        
-        return common_mistakes.get(topic, ["Check your work carefully"])
+        # Copy so callers can't modify the shared table
+        return list(COMMON_MISTAKES.get(topic, ("Check your work carefully",)))
 
     def generate_practice_question(
         self,
@@ -8,9 +8,13 @@ Uses FLAN-T5 for Q&A generation.
 
 from typing import List, Dict, Any
 from pathlib import Path
-from transformers import pipeline
+import json
+import queue
+import subprocess
+import sys
+import threading
 from src.agents.rag_system.embedding_service import EmbeddingService
-from src.agents.rag_system.vector_db import VectorDBService
+from src.agents.rag_system.vector_db import ISOLATE_WORKERS, VectorDBService
 
 
 class RAGEngine:
@@ -32,13 +36,14 @@ class RAGEngine:
         self.embedding_service = EmbeddingService(str(embedding_model_path))
         self.vector_db = VectorDBService(db_path)
         
-        # Initialize FLAN-T5 for Q&A (local model, runs offline)
-        flan_model_path = Path(model_dir) / "flan-t5-small"
-        self.qa_model = pipeline(
-            "text2text-generation",
-            model=str(flan_model_path),
-            device=-1  # CPU (use 0 for GPU if available)
-        )
+        # FLAN-T5 generator for in-process Q&A (loaded lazily on first question)
+        self._flan_generate = None
+        self._flan_load_lock = threading.Lock()
+
+        # Long-lived FLAN worker process (started lazily, reused across questions)
+        self._flan_proc = None
+        self._flan_lines = None
+        self._flan_lock = threading.Lock()
     
     def index_documents(self, collection_name: str, documents: List[Dict[str, Any]]):
         """
@@ -90,7 +95,8 @@ class RAGEngine:
     
     def generate_answer(self, context: str, question: str) -> str:
         """
-        Generate answer using FLAN-T5, executed in a subprocess to isolate crashes.
+        Generate answer using FLAN-T5, in-process or (with ISOLATE_WORKERS) in a
+        long-lived worker subprocess to isolate crashes.
         Falls back to returning the context snippet if the worker fails.
         """
         # Create prompt
@@ -101,46 +107,24 @@ Question: {question}
 
 Answer:"""
 
-        # Prepare payload
-        import json, tempfile, subprocess, sys, os
-        project_root = Path(__file__).resolve().parents[3]
-        worker = project_root / 'scripts' / 'flan_worker.py'
-
         payload = {
             'prompt': prompt,
             'max_new_tokens': 256
         }
 
         try:
-            print(f"[RAG_ENGINE] Starting FLAN worker for question: {question[:50]}...")
-            
-            with tempfile.NamedTemporaryFile('w', delete=False, suffix='.json') as tf:
-                json.dump(payload, tf)
-                tf.flush()
-                payload_path = tf.name
-
-            print(f"[RAG_ENGINE] Payload written to: {payload_path}")
-            cmd = [sys.executable, str(worker), payload_path]
-            print(f"[RAG_ENGINE] Running command: {' '.join(cmd)}")
-            
-            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            
-            # Clean up temp file
-            try:
-                os.unlink(payload_path)
-            except:
-                pass
-            
-            print(f"[RAG_ENGINE] FLAN worker return code: {proc.returncode}")
-            
-            if proc.returncode != 0:
-                err = proc.stderr or proc.stdout
-                print(f"[RAG_ENGINE] FLAN worker error: {err}")
-                raise RuntimeError(f"FLAN worker failed: {proc.returncode} - {err}")
+            if not ISOLATE_WORKERS:
+                print(f"[RAG_ENGINE] Generating in-process for question: {question[:50]}...")
+                result = {"generated_text": self._generate_in_process(payload)}
+            else:
+                print(f"[RAG_ENGINE] Sending question to FLAN worker: {question[:50]}...")
+                try:
+                    result = self._ask_flan_worker(payload, timeout=60)
+                except (OSError, EOFError) as e:
+                    # Persistent worker unavailable or crashed: fall back to a one-shot run
+                    print(f"[RAG_ENGINE] Persistent FLAN worker unavailable ({e}), running one-shot")
+                    result = self._run_flan_oneshot(payload, timeout=60)
 
-            print(f"[RAG_ENGINE] FLAN worker stdout: {proc.stdout[:200]}...")
-            result = json.loads(proc.stdout.strip())
-            
             if 'generated_text' in result:
                 answer = result['generated_text'].strip()
                 print(f"[RAG_ENGINE] Generated answer: {answer[:100]}...")
@@ -164,6 +148,89 @@ Answer:"""
             except Exception:
                 return "Unable to generate answer at this time. Please try again."
     
+    def _generate_in_process(self, payload: Dict[str, Any]) -> str:
+        """Run FLAN-T5 in this process, loading the model once on first use."""
+        if self._flan_generate is None:
+            with self._flan_load_lock:
+                if self._flan_generate is None:
+                    from scripts import flan_worker
+                    self._flan_generate = flan_worker.load_generator()
+        return self._flan_generate(payload['prompt'], payload['max_new_tokens'])
+
+    def _flan_worker_path(self) -> Path:
+        return Path(__file__).resolve().parents[3] / 'scripts' / 'flan_worker.py'
+
+    def _start_flan_worker(self):
+        """Spawn the FLAN worker in --serve mode; the model loads once per process."""
+        proc = subprocess.Popen(
+            [sys.executable, str(self._flan_worker_path()), '--serve'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        lines = queue.Queue()
+
+        def pump():
+            for line in proc.stdout:
+                lines.put(line)
+            lines.put(None)  # EOF: worker exited
+
+        threading.Thread(target=pump, daemon=True).start()
+        self._flan_proc = proc
+        self._flan_lines = lines
+        print(f"[RAG_ENGINE] Started persistent FLAN worker (pid {proc.pid})")
+
+    def _stop_flan_worker(self):
+        proc, self._flan_proc = self._flan_proc, None
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+
+    def _ask_flan_worker(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one request to the persistent worker and wait for its reply line."""
+        with self._flan_lock:
+            if self._flan_proc is None or self._flan_proc.poll() is not None:
+                self._start_flan_worker()
+            try:
+                self._flan_proc.stdin.write(json.dumps(payload) + "\n")
+                self._flan_proc.stdin.flush()
+                line = self._flan_lines.get(timeout=timeout)
+            except queue.Empty:
+                self._stop_flan_worker()
+                raise subprocess.TimeoutExpired('flan_worker --serve', timeout)
+            except OSError:
+                self._stop_flan_worker()
+                raise
+            if line is None:
+                self._stop_flan_worker()
+                raise EOFError("FLAN worker exited")
+            return json.loads(line)
+
+    def _run_flan_oneshot(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Run the FLAN worker once for a single payload file."""
+        import tempfile, os
+
+        with tempfile.NamedTemporaryFile('w', delete=False, suffix='.json') as tf:
+            json.dump(payload, tf)
+            payload_path = tf.name
+
+        try:
+            cmd = [sys.executable, str(self._flan_worker_path()), payload_path]
+            print(f"[RAG_ENGINE] Running command: {' '.join(cmd)}")
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        finally:
+            try:
+                os.unlink(payload_path)
+            except:
+                pass
+
+        print(f"[RAG_ENGINE] FLAN worker return code: {proc.returncode}")
+        if proc.returncode != 0:
+            err = proc.stderr or proc.stdout
+            print(f"[RAG_ENGINE] FLAN worker error: {err}")
+            raise RuntimeError(f"FLAN worker failed: {proc.returncode} - {err}")
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+
     def query(self, collection_name: str, question: str, top_k: int = 3) -> Dict[str, Any]:
         """
         Complete RAG pipeline: retrieve + generate.
@@ -5,13 +5,47 @@ Vector Database Service
 Local vector database using Chroma (offline).
 """
 
-import chromadb
+import hashlib
+import os
 from pathlib import Path
-from typing import List, Dict, Any
+import re
+import sys
+from typing import Any, Dict, List
 
+import chromadb
 
-import re
-import hashlib
+# Run the Chroma/FLAN workers as subprocesses instead of in-process calls.
+# Isolation guards the API process against native crashes (seen on Windows)
+# at the cost of a fresh interpreter, imports and model load per call.
+ISOLATE_WORKERS = os.getenv(
+    "RAG_ISOLATE_WORKERS", "1" if sys.platform == "win32" else "0"
+).lower() in ("1", "true", "yes")
+
+# Dtype of the embeddings side-car handed to the Chroma worker.
+# "float32" (default) ships the vectors as-is, so the worker path stores exactly
+# what the in-process path does. "int8" (symmetric per-row quantization, 4x
+# smaller) and "float16" (2x smaller) are opt-in and LOSSY: the worker upcasts
+# to float32 before collection.add (Chroma's HNSW index only stores float32),
+# but the stored values are the rounded ones, so distances and ranking shift.
+PAYLOAD_EMBEDDING_DTYPE = os.getenv("RAG_PAYLOAD_EMBEDDING_DTYPE", "float32").lower()
+
+# Compression for the JSON payload handed to the worker: "zstd" (used when the
+# zstandard package is installed) or "none". Pays off when the payload
+# directory sits on slow or network-attached storage.
+PAYLOAD_COMPRESSION = os.getenv("RAG_PAYLOAD_COMPRESSION", "zstd").lower()
+
+
+def quantize_per_row(embeddings):
+    """Symmetric per-row int8 quantization.
+
+    Returns (q, scales) with embeddings ~= q * scales[:, None].
+    """
+    import numpy as np
+
+    scales = np.abs(embeddings).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    q = np.round(embeddings / scales[:, None]).astype(np.int8)
+    return q, scales.astype(np.float32)
 
 
 def sanitize_collection_name(name: str) -> str:
@@ -90,42 +124,57 @@ class VectorDBService:
     
     def add_documents(self, collection_name: str, documents: List[Dict[str, Any]]):
         """
-        Add documents to collection using a subprocess worker to avoid crashing the main process
-        if the underlying vector DB has native crashes (observed on some platforms).
-        
-        This writes the documents to a temporary JSON payload and invokes the worker script
-        which performs the Chroma add operation in a separate process.
+        Add documents to collection.
+
+        Each document is a dict with 'content', 'embeddings' and optionally
+        'id' and 'metadata'; they are split into columns for add_columns.
         """
-        payload_dir = self.db_path / "_payloads"
-        payload_dir.mkdir(parents=True, exist_ok=True)
+        import numpy as np
 
-        payload = {
-            "collection_name": collection_name,
-            "documents": [
-                {
-                    "id": f"{collection_name}_{doc.get('id', i)}",
-                    "content": doc['content'],
-                    "embeddings": doc['embeddings'],
-                    "metadata": (doc.get('metadata') or {"source": collection_name, "doc_index": i})
-                }
-                for i, doc in enumerate(documents)
-            ]
-        }
+        ids = [f"{collection_name}_{doc.get('id', i)}" for i, doc in enumerate(documents)]
+        embeddings = np.asarray([doc['embeddings'] for doc in documents], dtype=np.float32)
+        metadatas = [
+            doc.get('metadata') or {"source": collection_name, "doc_index": i}
+            for i, doc in enumerate(documents)
+        ]
+        contents = [doc['content'] for doc in documents]
+        return self.add_columns(collection_name, ids, embeddings, contents, metadatas)
 
-        import json, tempfile, subprocess, sys
-        payload_file = payload_dir / f"payload_{collection_name}.json"
-        payload_file.write_text(json.dumps(payload))
+    def add_columns(self, collection_name: str, ids: List[str], embeddings,
+                    documents: List[str], metadatas: List[Dict[str, Any]]):
+        """
+        Add documents given as parallel columns.
 
-        worker = Path(__file__).resolve().parents[3] / 'scripts' / 'chroma_worker.py'
-        cmd = [sys.executable, str(worker), str(self.db_path), str(payload_file)]
+        Args:
+            collection_name: Collection name
+            ids: Document ids, used as given
+            embeddings: 2-D float32 array (one row per document)
+            documents: Document texts
+            metadatas: Document metadata dicts
+
+        By default the Chroma add runs in-process on this service's client. When
+        ISOLATE_WORKERS is set (default on Windows, where native Chroma crashes
+        were observed) the documents are handed to the worker script instead,
+        which performs the add in a separate process.
+        """
+        import json
+
+        import numpy as np
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
 
-        # Run worker
         try:
-            proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
-            if proc.returncode != 0:
-                # Log and raise error so caller can handle
-                err = proc.stderr or proc.stdout
-                raise RuntimeError(f"Chroma worker failed: {proc.returncode} - {err}")
+            if ISOLATE_WORKERS:
+                records = [
+                    {"id": doc_id, "content": content, "metadata": metadata}
+                    for doc_id, content, metadata in zip(ids, documents, metadatas)
+                ]
+                self._add_documents_subprocess(collection_name, records, embeddings)
+            else:
+                from scripts import chroma_worker
+                chroma_worker.add_columns(
+                    self.client, collection_name, ids, embeddings, metadatas, documents
+                )
             # Success: register collection locally
             collection = self.create_collection(collection_name)
             return True
@@ -135,12 +184,76 @@ class VectorDBService:
             fallback_dir.mkdir(parents=True, exist_ok=True)
             fallback_file = fallback_dir / f"{collection_name}.json"
             try:
-                import json
-                fallback_data = payload
+                # The fallback search reads embeddings inline
+                fallback_data = {
+                    "collection_name": collection_name,
+                    "documents": [
+                        {"id": doc_id, "content": content, "metadata": metadata,
+                         "embeddings": embedding}
+                        for doc_id, content, metadata, embedding
+                        in zip(ids, documents, metadatas, embeddings.tolist())
+                    ]
+                }
                 fallback_file.write_text(json.dumps(fallback_data))
                 return True
             except Exception as e2:
                 raise RuntimeError(f"Failed to add documents to vector DB and fallback failed: {e}; fallback error: {e2}")
+
+    def _add_documents_subprocess(self, collection_name: str, records: List[Dict[str, Any]], embeddings):
+        """
+        Write the documents to a JSON payload and run scripts/chroma_worker.py on it.
+        """
+        import json
+        import subprocess
+
+        import numpy as np
+
+        payload_dir = self.db_path / "_payloads"
+        payload_dir.mkdir(parents=True, exist_ok=True)
+
+        # Embeddings travel as a .npy side-car so the worker never boxes
+        # one Python float per dimension while decoding the JSON payload.
+        embeddings_file = payload_dir / f"payload_{collection_name}.npy"
+        embedding_info = {"dtype": "float32"}
+        if PAYLOAD_EMBEDDING_DTYPE == "int8" and len(embeddings):
+            q, scales = quantize_per_row(embeddings)
+            scales_file = payload_dir / f"payload_{collection_name}.scales.npy"
+            np.save(embeddings_file, q)
+            np.save(scales_file, scales)
+            embedding_info = {"dtype": "int8", "scales_file": str(scales_file)}
+        elif PAYLOAD_EMBEDDING_DTYPE == "float16":
+            np.save(embeddings_file, embeddings.astype(np.float16))
+            embedding_info = {"dtype": "float16"}
+        else:
+            np.save(embeddings_file, embeddings)
+
+        payload = {
+            "collection_name": collection_name,
+            "embeddings_file": str(embeddings_file),
+            **embedding_info,
+            "shape": list(embeddings.shape),
+            "documents": records
+        }
+
+        payload_bytes = json.dumps(payload).encode("utf-8")
+        payload_file = payload_dir / f"payload_{collection_name}.json"
+        if PAYLOAD_COMPRESSION == "zstd":
+            try:
+                import zstandard
+                payload_bytes = zstandard.ZstdCompressor(level=3).compress(payload_bytes)
+                payload_file = payload_file.with_suffix(".json.zst")
+            except ImportError:
+                pass
+        payload_file.write_bytes(payload_bytes)
+
+        worker = Path(__file__).resolve().parents[3] / 'scripts' / 'chroma_worker.py'
+        cmd = [sys.executable, str(worker), str(self.db_path), str(payload_file)]
+
+        proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        if proc.returncode != 0:
+            # Log and raise error so caller can handle
+            err = proc.stderr or proc.stdout
+            raise RuntimeError(f"Chroma worker failed: {proc.returncode} - {err}")
     
     def search(self, collection_name: str, query_embedding: List[float], 
                top_k: int = 5) -> List[Dict[str, Any]]:
@@ -18,7 +18,7 @@ from pydantic import BaseModel
 _project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(_project_root))
 
-from src.agents.agentic_system import AgentOrchestrator
+from src.agents.agentic_system import get_orchestrator
 from src.services.agent_trace_logger import AgentTraceLogger
 from src.services.system_prompt import SystemPromptService
 from src.logging import get_logger
@@ -31,7 +31,7 @@ router = APIRouter()
 
 # Initialize orchestrator and logger (with fallback)
 try:
-    orchestrator = AgentOrchestrator(project_root=project_root)
+    orchestrator = get_orchestrator(project_root)
     trace_logger = AgentTraceLogger(logs_dir=project_root / "logs")
 except Exception as e:
     logger.warning(f"Failed to initialize agentic system at module load: {e}")
@@ -33,6 +33,9 @@ except Exception as e:
     logger.warning(f"RAG agent initialization failed: {e}")
     rag_agent = None
 
+# Background indexing state per collection: {"status": "processing"|"ready"|"failed", ...}
+processing_status: Dict[str, Dict[str, Any]] = {}
+
 
 # =============================================================================
 # Pydantic Models
@@ -63,9 +66,14 @@ def process_pdf_task(file_path: str, collection_name: str):
         logger.info(f"[RAG] Background processing started for: {file_path}")
         result = rag_agent.upload_pdf(file_path, collection_name)
         logger.info(f"[RAG] Background processing complete: {result}")
+        if result.get("success"):
+            processing_status[collection_name] = {"status": "ready"}
+        else:
+            processing_status[collection_name] = {"status": "failed", "error": result.get("error")}
         return result
     except Exception as e:
         logger.error(f"[RAG] Background processing failed: {str(e)}", exc_info=True)
+        processing_status[collection_name] = {"status": "failed", "error": str(e)}
         return {"success": False, "error": str(e)}
 
 
@@ -134,6 +142,7 @@ async def upload_pdf(
             logger.warning("[RAG] Collection name sanitizer unavailable")
 
         # Add background task for processing
+        processing_status[final_collection_name] = {"status": "processing"}
         background_tasks.add_task(process_pdf_task, str(file_path), final_collection_name)
         
         logger.info(f"[RAG] PDF saved, processing queued for background")
@@ -210,6 +219,25 @@ async def query_rag(request: RAGQueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/rag/status/{collection_name}")
+async def get_collection_status(collection_name: str):
+    """Report whether a collection has finished background indexing."""
+    if rag_agent is None:
+        raise HTTPException(status_code=503, detail="RAG system not available")
+
+    state = processing_status.get(collection_name)
+    if state is None:
+        if collection_name not in rag_agent.uploaded_pdfs:
+            raise HTTPException(status_code=404, detail="Collection not found")
+        state = {"status": "ready"}
+
+    return {
+        "collection_name": collection_name,
+        "ready": state["status"] == "ready",
+        **state
+    }
+
+
 @router.get("/rag/collections")
 async def list_collections():
     """List all uploaded PDF collections."""
@@ -7,10 +7,58 @@ Tracks the complete flow of student requests through the agent system.
 """
 
 import json
+import os
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The trace log (shared with AgentOrchestrator) is append-only JSON lines;
+# once it grows past this size it is moved to "<name>.1" (replacing the
+# previous one) and a fresh file is started
+TRACE_LOG_MAX_BYTES = 8 * 1024 * 1024
+# Most traces returned by _load_traces
+MAX_LOADED_TRACES = 5000
+
+# Serializes rotate-then-append across every writer in this process
+_trace_write_lock = threading.Lock()
+
+
+def encode_trace_line(trace: Dict[str, Any]) -> bytes:
+    """One compact JSON line for the trace log (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(trace, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(trace, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def decode_trace_line(line: bytes) -> Dict[str, Any]:
+    """Parse one trace log line; raises ValueError if it is not valid JSON."""
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+def rotated_trace_path(trace_log: Path) -> Path:
+    """Where trace_log is moved when it is rotated."""
+    return trace_log.with_name(trace_log.name + ".1")
+
+
+def append_trace_lines(trace_log: Path, lines: List[bytes]) -> None:
+    """Append encoded trace lines, rotating the log first if it is too big."""
+    with _trace_write_lock:
+        # Rotate instead of trimming, so a write never rewrites old traces
+        try:
+            if trace_log.stat().st_size > TRACE_LOG_MAX_BYTES:
+                os.replace(trace_log, rotated_trace_path(trace_log))
+        except FileNotFoundError:
+            pass
+        
+        with trace_log.open("ab") as f:
+            f.writelines(lines)
+
 
 class AgentTraceLogger:
     """Logs and retrieves agent execution traces."""
@@ -18,38 +66,35 @@ class AgentTraceLogger:
     def __init__(self, logs_dir: Path = None):
         self.logs_dir = logs_dir or Path(__file__).parent.parent / "logs"
         self.logs_dir.mkdir(parents=True, exist_ok=True)
-        self.trace_log = self.logs_dir / "agent_trace.json"
+        self.trace_log = self.logs_dir / "agent_trace.jsonl"
+        self.rotated_trace_log = rotated_trace_path(self.trace_log)
         self.analytics_log = self.logs_dir / "agent_analytics.json"
 
     def log_trace(self, trace: Dict[str, Any]) -> None:
         """Log a complete agent trace."""
         try:
-            # Load existing traces
-            traces = self._load_traces()
-            
-            # Add new trace
-            traces.append({
+            entry = {
                 **trace,
                 "log_timestamp": datetime.now().isoformat(),
-            })
-            
-            # Keep last 5000 traces
-            traces = traces[-5000:]
-            
-            # Save traces
-            self.trace_log.write_text(json.dumps(traces, indent=2))
+            }
+            append_trace_lines(self.trace_log, [encode_trace_line(entry)])
         except Exception as e:
             print(f"Error logging trace: {e}")
 
     def _load_traces(self) -> List[Dict[str, Any]]:
-        """Load traces from file."""
-        if not self.trace_log.exists():
-            return []
-        
-        try:
-            return json.loads(self.trace_log.read_text())
-        except:
-            return []
+        """Load traces from file, oldest first."""
+        traces = []
+        for path in (self.rotated_trace_log, self.trace_log):
+            try:
+                with path.open("rb") as f:
+                    for line in f:
+                        try:
+                            traces.append(decode_trace_line(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+        return traces[-MAX_LOADED_TRACES:]
 
     def get_traces(
         self,